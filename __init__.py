@@ -1,10 +1,36 @@
-"""oc_skill — Opalstack API skill plugin for OpenClaw."""
+"""oc_skill — Opalstack API skill plugin for OpenClaw.
 
-from .app import ApplicationTools
-from .domain import DomainTools
-from .mariadb import MariaDBTools
-from .psqldb import PSQLDBTools
-from .osuser import OSUserTools
+Tool classes are imported on first attribute access, so importing the
+package (or reading the schema manifest, see ``oc_skill.manifest``) does not
+import the tool modules or ``requests``.
+"""
+
+from importlib import import_module
+from typing import Iterator, Optional, Sequence, Tuple
+
+# Registered tools: (class, module, method, asyncio variant or None).
+# oc_skill.manifest reads their schemas from source without importing them.
+REGISTRY: Tuple[Tuple[str, str, str, Optional[str]], ...] = (
+    ("ApplicationTools", "app",       "application", "AsyncApplicationTools"),
+    ("DomainTools",      "domain",    "domain",      "AsyncDomainTools"),
+    ("MariaDBTools",     "mariadb",   "mariadb",     "AsyncMariaDBTools"),
+    ("PSQLDBTools",      "psqldb",    "psqldb",      "AsyncPSQLDBTools"),
+    ("OSUserTools",      "osuser",    "osuser",      "AsyncOSUserTools"),
+    ("StackTools",       "stack",     "stack",       None),
+    ("InventoryTools",   "inventory", "inventory",   None),
+    ("SnapshotTools",    "inventory", "snapshot",    None),
+    ("TopologyTools",    "topology",  "topology",    None),
+    ("FanoutTools",      "fanout",    "fanout",      None),
+    ("WatchTools",       "watch",     "watch",       None),
+)
+
+# exported name -> defining submodule
+_LAZY = {}
+for _cls, _module, _method, _async in REGISTRY:
+    _LAZY[_cls] = _module
+    if _async:
+        _LAZY[_async] = _module
+del _cls, _module, _method, _async
 
 __all__ = [
     "ApplicationTools",
@@ -12,13 +38,56 @@ __all__ = [
     "MariaDBTools",
     "PSQLDBTools",
     "OSUserTools",
+    "StackTools",
+    "InventoryTools",
+    "SnapshotTools",
+    "TopologyTools",
+    "FanoutTools",
+    "WatchTools",
+    "AsyncApplicationTools",
+    "AsyncDomainTools",
+    "AsyncMariaDBTools",
+    "AsyncPSQLDBTools",
+    "AsyncOSUserTools",
 ]
 
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _LazyTools(Sequence):
+    """Read-only list of tool classes, each imported when first indexed."""
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = tuple(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [__getattr__(n) for n in self.names[index]]
+        return __getattr__(self.names[index])
+
+    def __iter__(self) -> Iterator[type]:
+        return (__getattr__(n) for n in self.names)
+
+    def __repr__(self) -> str:
+        return f"[{', '.join(self.names)}]"
+
+
 # Convenience: list of all tool classes for registration
-TOOLS = [
-    ApplicationTools,
-    DomainTools,
-    MariaDBTools,
-    PSQLDBTools,
-    OSUserTools,
-]
+TOOLS = _LazyTools([cls for cls, _, _, _ in REGISTRY])
+
+# asyncio variants (coroutine tool methods); need the ``async`` extra (httpx)
+ASYNC_TOOLS = _LazyTools([a for _, _, _, a in REGISTRY if a])
@@ -1,45 +1,27 @@
-from typing import Literal, Any, Dict
+from concurrent.futures import Future
+from typing import Literal, Any, AsyncIterator, Dict, Iterator, Optional, Sequence
 import logging
 
-from .transport import Transport
-from .skill import SkillBase
+from . import coalesce
+from .transport import get_async_transport, get_transport
+from .skill import AsyncSkillBase, SkillBase, validated
+from .batch import amutate_many, aread_many, mutate_many, read_many
+from .installers import CATALOGUE, aresolve, resolve
+from .installers import INSTALLERS  # noqa: F401  re-exported as app.INSTALLERS
+from .poll import await_ready, wait_ready
 
 logger = logging.getLogger("oc_skill.app")
 
-# ── installer catalogue (static, mirrors opalstack/installers on GitHub) ──────
-INSTALLERS = [
-    {"selected_type": "wordpress",  "name": "WordPress",         "app_type": "NPF",
-     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/wordpress/install.sh",
-             "el9": "https://raw.githubusercontent.com/opalstack/installers/refs/heads/master/el9/wordpress/install.sh"},
-     "json": {"auto_site_url": True, "fpm_max_requests": 250, "fpm_max_children": 25, "php_version": 83, "gzip": True, "expires": "off"}},
-    {"selected_type": "laravel",    "name": "Laravel",           "app_type": "NPF",
-     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/laravel/install.py",
-             "el9": "https://raw.githubusercontent.com/opalstack/installers/master/el9/laravel/install.py"},
-     "json": {"fpm_max_requests": 250, "fpm_max_children": 25, "gzip": True, "php_version": 83, "subroot": "project/public", "expires": "off"}},
-    {"selected_type": "nextjs",     "name": "Next.js",           "app_type": "CUS",
-     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/nextjs/install.py",
-             "el9": "https://raw.githubusercontent.com/opalstack/installers/master/el9/nextjs/install.py"},
-     "json": {"gzip": True, "expires": "off"}},
-    {"selected_type": "ghost",      "name": "Ghost",             "app_type": "CUS",
-     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/ghost/install.py",
-             "el9": "https://raw.githubusercontent.com/opalstack/installers/refs/heads/master/el9/ghost/install.py"},
-     "json": {"gzip": True, "expires": "off"}},
-    {"selected_type": "django",     "name": "Django",            "app_type": "CUS",
-     "url": {"el9": "https://raw.githubusercontent.com/opalstack/installers/master/el9/django/install.py"},
-     "json": {"gzip": True, "expires": "off"}},
-    {"selected_type": "static_only","name": "Nginx Static Only", "app_type": "STA",
-     "url": {},
-     "json": {"gzip": True, "expires": "off"}},
-]
-
-
 class ApplicationAPI:
     def __init__(self, token: str) -> None:
-        self.http = Transport(token=token)
+        self.http = get_transport(token)
 
     def list(self) -> list:
         return self.http.get("/app/list/")
 
+    def iter_list(self, fields: Optional[Sequence[str]] = None) -> Iterator[dict]:
+        return self.http.iter_list("/app/list/", fields=fields)
+
     def read(self, data: Dict[str, Any]) -> dict:
         return self.http.get(f"/app/read/{data['id']}")
 
@@ -47,16 +29,54 @@ class ApplicationAPI:
         return self.http.post("/app/create/", [data])
 
     def update(self, data: Dict[str, Any]) -> dict:
-        return self.http.post("/app/update/", [data])
+        return coalesce.update(self.http, "/app/update/", data)
+
+    def update_later(self, data: Dict[str, Any]) -> Future:
+        """Queue an update; with write-behind on, merged with others for the same id."""
+        return coalesce.update_later(self.http, "/app/update/", data)
+
+    def queue_update(self, data: Dict[str, Any]) -> dict:
+        return coalesce.queue(self.http, "/app/update/", data)
+
+    def flush_updates(self, data: Any = None) -> dict:
+        return coalesce.flush(self.http, "/app/update/")
 
     def delete(self, data: Dict[str, Any]) -> Any:
         return self.http.post("/app/delete/", [data])
 
+    def create_many(self, data: Any) -> dict:
+        return mutate_many(self.http, "/app/create/", data)
+
+    def update_many(self, data: Any) -> dict:
+        return mutate_many(self.http, "/app/update/", data)
+
+    def delete_many(self, data: Any) -> dict:
+        return mutate_many(self.http, "/app/delete/", data)
+
+    def read_many(self, data: Any) -> dict:
+        return read_many(self.http, "/app/read/{id}", data)
+
+    def wait_ready(self, data: Any) -> dict:
+        return wait_ready(self.http, "/app/list/", data)
+
+    def installer_urls(self, data: Any = None) -> Any:
+        data = data or {}
+        if data.get("type"):
+            return CATALOGUE.get(data["type"])
+        return CATALOGUE.entries(data.get("os"))
+
+    def installer_resolve(self, data: Dict[str, Any]) -> dict:
+        return resolve(self.http, data)
+
 
 class ApplicationTools(SkillBase):
+    @validated
     def application(
         self,
-        action: Literal["list", "read", "create", "update", "delete", "installer_urls"],
+        action: Literal["list", "read", "create", "update", "delete",
+                        "read_many", "create_many", "update_many", "delete_many",
+                        "wait_ready", "update_later", "flush",
+                        "installer_urls", "installer_resolve"],
         payload: Any | None = None,
     ):
         """---
@@ -65,8 +85,10 @@ class ApplicationTools(SkillBase):
             Manages web applications on the Opalstack platform.
 
             ⚠️  INSTALLER WORKFLOW — for any installer-based app:
-              1. Call action "installer_urls" to get correct app_type and url.
-              2. Create with those exact values.
+              1. Call action "installer_resolve" with the installer type and
+                 osuser; it returns the /app/create/ payload for that
+                 server's OS (or use "installer_urls" to browse).
+              2. Create with that payload.
 
             Parent: OSUser.  All mutating calls auto-wrap payload in a list.
 
@@ -75,9 +97,9 @@ class ApplicationTools(SkillBase):
             properties:
                 action:
                     type: string
-                    enum: [list, read, create, update, delete, installer_urls]
+                    enum: [list, read, read_many, create, update, delete, create_many, update_many, delete_many, wait_ready, update_later, flush, installer_urls, installer_resolve]
                 payload:
-                    type: [object, "null"]
+                    type: [object, array, "null"]
             required: [action]
 
         actions:
@@ -112,17 +134,174 @@ class ApplicationTools(SkillBase):
                     required: [id]
                     properties:
                         id: { type: string, format: uuid }
-            installer_urls:
-                summary: Return the catalogue of available one-click installers.
+            read_many:
+                summary: Fetch many applications by UUID concurrently; per-id results in input order.
+                payload:
+                    required: [ids]
+                    properties:
+                        ids:         { type: array, items: { type: string, format: uuid } }
+                        max_workers: { type: integer, default: 8 }
+            create_many:
+                summary: Create many applications in chunked list POSTs; per-item results.
+                payload:
+                    required: [items]
+                    properties:
+                        items:       { type: array, items: { type: object }, description: "app create payloads" }
+                        chunk_size:  { type: integer, default: 50 }
+                        concurrency: { type: integer, default: 1 }
+            update_many:
+                summary: Update many applications in chunked list POSTs; per-item results.
+                payload:
+                    required: [items]
+                    properties:
+                        items:       { type: array, items: { type: object }, description: "app update payloads with id" }
+                        chunk_size:  { type: integer, default: 50 }
+                        concurrency: { type: integer, default: 1 }
+                        retry:       { type: boolean, default: false, description: "Retry transient 5xx/connection errors." }
+            delete_many:
+                summary: Delete many applications in chunked list POSTs; per-item results.
+                payload:
+                    required: [items]
+                    properties:
+                        items:       { type: array, items: { type: object }, description: "objects with id" }
+                        chunk_size:  { type: integer, default: 50 }
+                        concurrency: { type: integer, default: 1 }
+                        retry:       { type: boolean, default: false, description: "Retry transient 5xx/connection errors." }
+            wait_ready:
+                summary: Poll until the given applications report ready, one list call per round.
+                payload:
+                    required: [ids]
+                    properties:
+                        ids:          { type: array, items: { type: string, format: uuid } }
+                        timeout:      { type: number, default: 300 }
+                        interval:     { type: number, default: 1 }
+                        max_interval: { type: number, default: 15 }
+            update_later:
+                summary: Queue an update and return at once. With write-behind on, updates within the window merge into one POST; flush reports the results.
+                payload:
+                    required: [id]
+                    properties:
+                        id: { type: string, format: uuid }
+            flush:
+                summary: Send queued updates now; per-id results of every update_later since the last flush.
                 payload: null
+            installer_urls:
+                summary: Return the one-click installer catalogue, optionally one type or one OS.
+                payload:
+                    properties:
+                        type: { type: string, description: "selected_type, e.g. wordpress; returns that entry." }
+                        os:   { type: string, description: "el7 or el9; installers with a build for it." }
+            installer_resolve:
+                summary: Resolve the osuser's server OS and return a ready /app/create/ payload.
+                payload:
+                    required: [type, osuser]
+                    properties:
+                        type:   { type: string, description: "Installer selected_type, e.g. wordpress." }
+                        osuser: { type: string, format: uuid }
+                        name:   { type: string, description: "App name; defaults to the installer type." }
+                        os:     { type: string, description: "Skip the lookup and use this OS (el7/el9)." }
+                        json:   { type: object, description: "Overrides merged over the installer defaults." }
         ...
         """
         api = ApplicationAPI(token=self._token())
         return {
-            "list":           lambda _: api.list(),
-            "read":           api.read,
-            "create":         api.create,
-            "update":         api.update,
-            "delete":         api.delete,
-            "installer_urls": lambda _: INSTALLERS,
+            "list":              lambda _: api.list(),
+            "read":              api.read,
+            "create":            api.create,
+            "update":            api.update,
+            "delete":            api.delete,
+            "create_many":       api.create_many,
+            "update_many":       api.update_many,
+            "delete_many":       api.delete_many,
+            "read_many":         api.read_many,
+            "wait_ready":        api.wait_ready,
+            "update_later":      api.queue_update,
+            "flush":             api.flush_updates,
+            "installer_urls":    api.installer_urls,
+            "installer_resolve": api.installer_resolve,
         }[action](payload or {})
+
+
+class AsyncApplicationAPI:
+    def __init__(self, token: str) -> None:
+        self.http = get_async_transport(token)
+
+    async def list(self) -> list:
+        return await self.http.get("/app/list/")
+
+    def iter_list(self, fields: Optional[Sequence[str]] = None) -> AsyncIterator[dict]:
+        return self.http.iter_list("/app/list/", fields=fields)
+
+    async def read(self, data: Dict[str, Any]) -> dict:
+        return await self.http.get(f"/app/read/{data['id']}")
+
+    async def create(self, data: Dict[str, Any]) -> dict:
+        return await self.http.post("/app/create/", [data])
+
+    async def update(self, data: Dict[str, Any]) -> dict:
+        return await coalesce.aupdate(self.http, "/app/update/", data)
+
+    async def queue_update(self, data: Dict[str, Any]) -> dict:
+        return await coalesce.aqueue(self.http, "/app/update/", data)
+
+    async def flush_updates(self, data: Any = None) -> dict:
+        return await coalesce.aflush(self.http, "/app/update/")
+
+    async def delete(self, data: Dict[str, Any]) -> Any:
+        return await self.http.post("/app/delete/", [data])
+
+    async def create_many(self, data: Any) -> dict:
+        return await amutate_many(self.http, "/app/create/", data)
+
+    async def update_many(self, data: Any) -> dict:
+        return await amutate_many(self.http, "/app/update/", data)
+
+    async def delete_many(self, data: Any) -> dict:
+        return await amutate_many(self.http, "/app/delete/", data)
+
+    async def read_many(self, data: Any) -> dict:
+        return await aread_many(self.http, "/app/read/{id}", data)
+
+    async def wait_ready(self, data: Any) -> dict:
+        return await await_ready(self.http, "/app/list/", data)
+
+    async def installer_urls(self, data: Any = None) -> Any:
+        data = data or {}
+        if data.get("type"):
+            return CATALOGUE.get(data["type"])
+        return CATALOGUE.entries(data.get("os"))
+
+    async def installer_resolve(self, data: Dict[str, Any]) -> dict:
+        return await aresolve(self.http, data)
+
+
+class AsyncApplicationTools(AsyncSkillBase):
+    @validated
+    async def application(
+        self,
+        action: Literal["list", "read", "create", "update", "delete",
+                        "read_many", "create_many", "update_many", "delete_many",
+                        "wait_ready", "update_later", "flush",
+                        "installer_urls", "installer_resolve"],
+        payload: Any | None = None,
+    ):
+        api = AsyncApplicationAPI(token=self._token())
+        return await {
+            "list":              lambda _: api.list(),
+            "read":              api.read,
+            "create":            api.create,
+            "update":            api.update,
+            "delete":            api.delete,
+            "create_many":       api.create_many,
+            "update_many":       api.update_many,
+            "delete_many":       api.delete_many,
+            "read_many":         api.read_many,
+            "wait_ready":        api.wait_ready,
+            "update_later":      api.queue_update,
+            "flush":             api.flush_updates,
+            "installer_urls":    api.installer_urls,
+            "installer_resolve": api.installer_resolve,
+        }[action](payload or {})
+
+
+AsyncApplicationTools.application.__doc__ = ApplicationTools.application.__doc__
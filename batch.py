@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from .resilience import bind
+from .transport import AsyncTransport, Transport
+
+logger = logging.getLogger("oc_skill.batch")
+
+CHUNK_SIZE = 50
+MAX_CONCURRENCY = 16
+READ_WORKERS = 8
+
+
+def _batch_args(data: Any) -> tuple[list, int, int, bool]:
+    """Accept either a bare list or {items, chunk_size, concurrency, retry}."""
+    if isinstance(data, list):
+        return data, CHUNK_SIZE, 1, False
+    items = data.get("items") or []
+    size = max(1, int(data.get("chunk_size") or CHUNK_SIZE))
+    workers = min(MAX_CONCURRENCY, max(1, int(data.get("concurrency") or 1)))
+    return items, size, workers, bool(data.get("retry"))
+
+
+def _error(exc: Exception) -> Any:
+    payload = exc.args[0] if exc.args else None
+    if isinstance(payload, (dict, list)) or (isinstance(exc, RuntimeError) and isinstance(payload, str)):
+        return payload
+    # network errors wrap urllib3/httpcore objects that are not JSON-safe
+    return {"detail": f"{type(exc).__name__}: {exc}"}
+
+
+def _failures(http: Any) -> tuple:
+    """Exceptions one chunk or id may raise without failing the whole batch:
+    APIError, CircuitOpenError, DeadlineExceeded and the transport's network
+    errors (which POSTs do not retry by default)."""
+    return (RuntimeError,) + http._net_errors
+
+
+def _read_args(data: Any) -> tuple[list, int]:
+    """Accept either a bare list of ids or {ids, max_workers}."""
+    if isinstance(data, list):
+        return data, READ_WORKERS
+    workers = int(data.get("max_workers") or READ_WORKERS)
+    return list(data.get("ids") or []), min(MAX_CONCURRENCY, max(1, workers))
+
+
+def _chunk_results(path: str, start: int, part: list, resp: Any,
+                   exc: Optional[Exception] = None) -> List[Dict[str, Any]]:
+    if exc is not None:
+        logger.warning("%s chunk @%d failed: %s", path, start, exc)
+        return [{"index": start + j, "ok": False, "error": _error(exc)}
+                for j in range(len(part))]
+    aligned = isinstance(resp, list) and len(resp) == len(part)
+    return [{"index": start + j, "ok": True,
+             "result": resp[j] if aligned else None}
+            for j in range(len(part))]
+
+
+def _summary(parts: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    results = [r for part in parts for r in part]
+    failed = sum(1 for r in results if not r["ok"])
+    return {"ok": len(results) - failed, "failed": failed, "results": results}
+
+
+def mutate_many(http: Transport, path: str, data: Any) -> Dict[str, Any]:
+    """POST ``items`` to a list-shaped mutation endpoint in chunks.
+
+    Each chunk is one round trip; chunks run concurrently when
+    ``concurrency`` > 1. A failed chunk marks only its own items as failed.
+    ``retry`` opts chunks into transient-error retries (safe for
+    idempotent updates/deletes). Concurrency is capped at the transport's
+    connection pool size, so no socket is opened only to be discarded.
+    Results keep input order: ``{"index", "ok", "result" | "error"}``.
+    """
+    items, size, workers, retry = _batch_args(data)
+    workers = min(workers, http.pool_size)
+    chunks = [(i, items[i:i + size]) for i in range(0, len(items), size)]
+    failures = _failures(http)
+
+    def send(chunk: tuple[int, list]) -> List[Dict[str, Any]]:
+        start, part = chunk
+        try:
+            resp = http.post(path, part, retry=retry)
+            return _chunk_results(path, start, part, resp)
+        except failures as exc:
+            return _chunk_results(path, start, part, None, exc)
+
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            parts = list(pool.map(bind(send), chunks))
+    else:
+        parts = [send(c) for c in chunks]
+    return _summary(parts)
+
+
+async def amutate_many(http: AsyncTransport, path: str,
+                       data: Any) -> Dict[str, Any]:
+    """asyncio form of mutate_many with the same payload and result shape."""
+    items, size, workers, retry = _batch_args(data)
+    chunks = [(i, items[i:i + size]) for i in range(0, len(items), size)]
+    sem = asyncio.Semaphore(workers)
+    failures = _failures(http)
+
+    async def send(chunk: tuple[int, list]) -> List[Dict[str, Any]]:
+        start, part = chunk
+        async with sem:
+            try:
+                resp = await http.post(path, part, retry=retry)
+            except failures as exc:
+                return _chunk_results(path, start, part, None, exc)
+        return _chunk_results(path, start, part, resp)
+
+    return _summary(await asyncio.gather(*(send(c) for c in chunks)))
+
+
+def read_many(http: Transport, path: str, data: Any) -> Dict[str, Any]:
+    """GET ``path.format(id=...)`` for every id over a bounded worker pool.
+
+    Results keep input order as ``{"id", "ok", "result" | "error"}``; one
+    failed id never fails the batch. Workers are capped at the transport's
+    connection pool size.
+    """
+    ids, workers = _read_args(data)
+    workers = min(workers, http.pool_size)
+    failures = _failures(http)
+
+    def fetch(oid: str) -> Dict[str, Any]:
+        try:
+            return {"id": oid, "ok": True, "result": http.get(path.format(id=oid))}
+        except failures as exc:
+            return {"id": oid, "ok": False, "error": _error(exc)}
+
+    if workers > 1 and len(ids) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(ids))) as pool:
+            results = list(pool.map(bind(fetch), ids))
+    else:
+        results = [fetch(i) for i in ids]
+    failed = sum(1 for r in results if not r["ok"])
+    return {"ok": len(results) - failed, "failed": failed, "results": results}
+
+
+async def aread_many(http: AsyncTransport, path: str,
+                     data: Any) -> Dict[str, Any]:
+    """asyncio form of read_many with the same payload and result shape."""
+    ids, workers = _read_args(data)
+    sem = asyncio.Semaphore(workers)
+    failures = _failures(http)
+
+    async def fetch(oid: str) -> Dict[str, Any]:
+        async with sem:
+            try:
+                result = await http.get(path.format(id=oid))
+            except failures as exc:
+                return {"id": oid, "ok": False, "error": _error(exc)}
+        return {"id": oid, "ok": True, "result": result}
+
+    results = await asyncio.gather(*(fetch(i) for i in ids))
+    failed = sum(1 for r in results if not r["ok"])
+    return {"ok": len(results) - failed, "failed": failed, "results": results}
@@ -0,0 +1,323 @@
+"""Benchmark harness: drives every resource tool against the local stub API.
+
+Starts ``oc_skill.stub`` in a subprocess (or in-process with --in-process),
+points ``transport.BASE_URL`` at it and runs create/read/update/list/delete
+for each resource tool, serially, on a thread pool and (with httpx
+installed) on asyncio. Reports p50/p99 latency, calls per second, TCP
+connections and requests seen by the stub, and the tracemalloc peak. Writes
+the results as JSON for later comparison.
+
+    python -m oc_skill.bench --calls 200 --concurrency 16 --latency 5
+    python -m oc_skill.bench --output new.json --compare old.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.request import Request, urlopen
+
+from . import transport
+from .stub import StubConfig, add_arguments, config_from, serve
+
+TOKEN = "bench-token"
+
+# resource -> (tool class, tool method)
+RESOURCES = {
+    "osuser":  ("OSUserTools",      "osuser"),
+    "app":     ("ApplicationTools", "application"),
+    "domain":  ("DomainTools",      "domain"),
+    "mariadb": ("MariaDBTools",     "mariadb"),
+    "psqldb":  ("PSQLDBTools",      "psqldb"),
+}
+ACTIONS = ("create", "read", "update", "list", "delete")
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of ``values`` (need not be sorted)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+class Stub:
+    """The stub API, either a child process or a thread in this process."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.proc: Optional[subprocess.Popen] = None
+        self.server = None
+        if args.url:
+            self.url = args.url
+        elif args.in_process:
+            self.server, self.url = serve(config_from(args))
+        else:
+            pkg_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [pkg_parent, env.get("PYTHONPATH")]))
+            cmd = [sys.executable, "-m", f"{__package__}.stub"]
+            for name in ("latency", "jitter", "error_rate", "rate_429",
+                         "retry_after", "list_size", "pad", "seed"):
+                cmd += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+            self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, env=env)
+            self.url = self.proc.stdout.readline().strip()
+            if not self.url:
+                raise RuntimeError("stub server failed to start")
+        self.root = self.url.split("/api/", 1)[0]
+
+    def _call(self, method: str, path: str) -> dict:
+        req = Request(self.root + path, data=b"[]" if method == "POST" else None,
+                      method=method, headers={"Content-Type": "application/json"})
+        with urlopen(req, timeout=10) as resp:
+            return json.load(resp)
+
+    def reset(self) -> None:
+        self._call("POST", "/_reset")
+
+    def stats(self) -> dict:
+        return self._call("GET", "/_stats")
+
+    def close(self) -> None:
+        if self.proc is not None:
+            self.proc.terminate()
+            self.proc.wait(timeout=5)
+        if self.server is not None:
+            self.server.shutdown()
+
+
+class Context:
+    """Ids the create/read/update/delete payloads refer to."""
+
+    def __init__(self) -> None:
+        http = transport.get_transport(TOKEN)
+        osuser = http.get("/osuser/list/", fresh=True)[0]
+        self.server: str = osuser["server"]
+        self.osuser: str = osuser["id"]
+        self.created: Dict[str, List[str]] = {}
+
+    def payloads(self, resource: str, action: str, calls: int, tag: str) -> List[Any]:
+        if action == "list":
+            return [None] * calls
+        if action == "create":
+            base: Dict[str, Any] = {"app":     {"osuser": self.osuser, "type": "STA"},
+                                    "osuser":  {"server": self.server},
+                                    "mariadb": {"server": self.server},
+                                    "psqldb":  {"server": self.server},
+                                    "domain":  {}}[resource]
+            return [{**base, "name": f"bench{tag}{i}"} for i in range(calls)]
+        ids = self.created.get(resource, [])
+        if action == "update" and resource in ("app", "domain", "osuser"):
+            return [{"id": oid, "name": f"bench{tag}{i}u"} for i, oid in enumerate(ids)]
+        return [{"id": oid} for oid in ids]
+
+
+def _record(results: List[Any], created: List[str]) -> None:
+    for res in results:
+        if isinstance(res, list) and res and isinstance(res[0], dict) and "id" in res[0]:
+            created.append(res[0]["id"])
+
+
+def _summarise(latencies: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    ms = [x * 1000 for x in latencies]
+    return {
+        "calls":   len(latencies),
+        "errors":  errors,
+        "p50_ms":  round(percentile(ms, 50), 3),
+        "p99_ms":  round(percentile(ms, 99), 3),
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "max_ms":  round(max(ms), 3) if ms else 0.0,
+        "rps":     round(len(latencies) / wall, 1) if wall else 0.0,
+    }
+
+
+def _run_sync(call: Callable[[Any], Any], payloads: List[Any],
+              workers: int) -> Tuple[Dict[str, Any], List[Any]]:
+    def one(payload: Any) -> Tuple[float, Any, bool]:
+        start = time.perf_counter()
+        try:
+            result = call(payload)
+            return time.perf_counter() - start, result, True
+        except Exception:
+            return time.perf_counter() - start, None, False
+
+    start = time.perf_counter()
+    if workers <= 1:
+        outcomes = [one(p) for p in payloads]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(one, payloads))
+    wall = time.perf_counter() - start
+    summary = _summarise([o[0] for o in outcomes], sum(not o[2] for o in outcomes), wall)
+    return summary, [o[1] for o in outcomes]
+
+
+async def _run_async(call: Callable[[Any], Any], payloads: List[Any],
+                     workers: int) -> Tuple[Dict[str, Any], List[Any]]:
+    sem = asyncio.Semaphore(max(1, workers))
+
+    async def one(payload: Any) -> Tuple[float, Any, bool]:
+        async with sem:
+            start = time.perf_counter()
+            try:
+                result = await call(payload)
+                return time.perf_counter() - start, result, True
+            except Exception:
+                return time.perf_counter() - start, None, False
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(p) for p in payloads))
+    wall = time.perf_counter() - start
+    summary = _summarise([o[0] for o in outcomes], sum(not o[2] for o in outcomes), wall)
+    return summary, [o[1] for o in outcomes]
+
+
+def _async_available() -> bool:
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def bench(args: argparse.Namespace, stub: Stub) -> Dict[str, Any]:
+    tools = import_module(__package__)
+    os.environ["OPALSTACK_API_TOKEN"] = TOKEN
+    transport.BASE_URL = stub.url
+    ctx = Context()
+    modes = [("serial", 1), ("threads", args.concurrency)]
+    if args.use_async and _async_available():
+        modes.append(("async", args.concurrency))
+    if args.memory:
+        tracemalloc.start()
+    rows: List[Dict[str, Any]] = []
+    loop = asyncio.new_event_loop() if any(m == "async" for m, _ in modes) else None
+    try:
+        for mode, workers in modes:
+            for resource in args.resources:
+                cls_name, method = RESOURCES[resource]
+                for action in ACTIONS:
+                    payloads = ctx.payloads(resource, action, args.calls, mode[0])
+                    stub.reset()
+                    if args.memory:
+                        tracemalloc.reset_peak()
+                    if mode == "async":
+                        tool = getattr(tools, "Async" + cls_name)()
+                        call = lambda p, t=tool, a=action: getattr(t, method)(a, p)
+                        summary, results = loop.run_until_complete(
+                            _run_async(call, payloads, workers))
+                    else:
+                        tool = getattr(tools, cls_name)()
+                        call = lambda p, t=tool, a=action: getattr(t, method)(a, p)
+                        summary, results = _run_sync(call, payloads, workers)
+                    if action == "create":
+                        ctx.created[resource] = []
+                        _record(results, ctx.created[resource])
+                    served = stub.stats()
+                    row = {"resource": resource, "action": action, "mode": mode,
+                           "workers": workers, **summary,
+                           "connections": served["connections"],
+                           "requests": served["requests"],
+                           "status": served["status"],
+                           "bytes_in": served["bytes_out"]}
+                    if args.memory:
+                        row["peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+                    rows.append(row)
+                    print(_line(row), flush=True)
+    finally:
+        if loop is not None:
+            loop.run_until_complete(transport.ashutdown())
+            loop.close()
+        if args.memory:
+            tracemalloc.stop()
+    return {
+        "version": 1,
+        "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "stub": {k: getattr(args, k) for k in vars(StubConfig()) if hasattr(args, k)},
+        "transport": {"pool_size": transport.POOL_SIZE,
+                      "retries": transport.RETRY.retries,
+                      "cache": transport.CACHE is not None},
+        "flights": transport.FLIGHTS.stats(),
+        "endpoints": transport.METRICS.stats(),
+        "results": rows,
+    }
+
+
+_HEADER = (f"{'resource':<8} {'action':<7} {'mode':<7} {'calls':>6} {'err':>4} "
+           f"{'p50 ms':>8} {'p99 ms':>8} {'calls/s':>9} {'conns':>5} {'reqs':>6} {'peak KiB':>9}")
+
+
+def _line(row: Dict[str, Any]) -> str:
+    return (f"{row['resource']:<8} {row['action']:<7} {row['mode']:<7} {row['calls']:>6} "
+            f"{row['errors']:>4} {row['p50_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+            f"{row['rps']:>9.1f} {row['connections']:>5} {row['requests']:>6} "
+            f"{row.get('peak_kib', 0):>9.1f}")
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Per-scenario p50/p99/calls-per-second change from ``old`` to ``new``."""
+    key = lambda r: (r["resource"], r["action"], r["mode"])
+    before = {key(r): r for r in old.get("results", [])}
+    lines = [f"{'resource':<8} {'action':<7} {'mode':<7} {'p50':>9} {'p99':>9} {'calls/s':>9}"]
+    for row in new["results"]:
+        prev = before.get(key(row))
+        if prev is None:
+            continue
+        pct = lambda a, b: f"{(b - a) / a * 100:+8.1f}%" if a else f"{'n/a':>9}"
+        lines.append(f"{row['resource']:<8} {row['action']:<7} {row['mode']:<7} "
+                     f"{pct(prev['p50_ms'], row['p50_ms'])} {pct(prev['p99_ms'], row['p99_ms'])} "
+                     f"{pct(prev['rps'], row['rps'])}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark oc_skill against a local stub API.")
+    parser.add_argument("--calls", type=int, default=100, help="calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="threads / async tasks")
+    parser.add_argument("--resources", nargs="+", choices=list(RESOURCES), default=list(RESOURCES))
+    parser.add_argument("--output", default="bench.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    parser.add_argument("--url", help="use an already running stub at this base URL")
+    parser.add_argument("--in-process", action="store_true", help="run the stub on a thread here")
+    parser.add_argument("--no-async", dest="use_async", action="store_false")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip tracemalloc (lower overhead)")
+    parser.add_argument("--verbose", action="store_true", help="show retry/error logs")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        logging.getLogger(__package__).setLevel(logging.ERROR)
+
+    stub = Stub(args)
+    try:
+        print(_HEADER)
+        report = bench(args, stub)
+    finally:
+        transport.shutdown()
+        stub.close()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), report)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
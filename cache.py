@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Seconds a cached list/read response stays fresh, per resource.
+DEFAULT_TTL: Dict[str, float] = {
+    "app":     30.0,
+    "osuser":  60.0,
+    "domain":  60.0,
+    "mariadb": 60.0,
+    "psqldb":  60.0,
+}
+
+
+def resource_of(path: str) -> str:
+    """'/app/read/<id>' -> 'app'."""
+    return path.strip("/").split("/", 1)[0]
+
+
+def cacheable(path: str) -> bool:
+    parts = path.strip("/").split("/")
+    return len(parts) >= 2 and parts[1] in ("list", "read")
+
+
+class ResponseCache:
+    """Bounded LRU of raw JSON bodies for GET list/read responses.
+
+    Entries are keyed by (transport key, path, params) and expire after the
+    resource's TTL. Any mutation of a resource through Transport.post drops
+    that account's entries for the resource and bumps a generation counter,
+    so a GET that was already in flight cannot store a stale body afterwards.
+    Bodies are kept as bytes; each hit is parsed fresh, so callers may mutate
+    what they get back.
+    """
+
+    def __init__(self, ttl: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 30.0, maxsize: int = 256) -> None:
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Hashable, tuple[float, str, bytes]]" = OrderedDict()
+        self._gen: Dict[tuple, int] = {}
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """OPALSTACK_CACHE=1 enables; OPALSTACK_CACHE_TTL="app=15,domain=120"."""
+        if not os.getenv("OPALSTACK_CACHE"):
+            return None
+        ttl = {}
+        for pair in filter(None, os.getenv("OPALSTACK_CACHE_TTL", "").split(",")):
+            name, _, secs = pair.partition("=")
+            ttl[name.strip()] = float(secs)
+        return cls(ttl=ttl,
+                   maxsize=int(os.getenv("OPALSTACK_CACHE_SIZE", "256")))
+
+    def generation(self, owner: Hashable, resource: str) -> int:
+        with self._lock:
+            return self._gen.get((owner, resource), 0)
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: tuple, resource: str, body: bytes, gen: int) -> None:
+        """Store ``body`` unless ``resource`` was mutated since ``gen``."""
+        expires = time.monotonic() + self.ttl.get(resource, self.default_ttl)
+        with self._lock:
+            if self._gen.get((key[0], resource), 0) != gen:
+                return
+            self._items[key] = (expires, resource, body)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, owner: Hashable, resource: str) -> int:
+        with self._lock:
+            self._gen[(owner, resource)] = self._gen.get((owner, resource), 0) + 1
+            stale = [k for k, v in self._items.items()
+                     if k[0] == owner and v[1] == resource]
+            for k in stale:
+                del self._items[k]
+            self.invalidations += 1
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits":          self.hits,
+                "misses":        self.misses,
+                "evictions":     self.evictions,
+                "invalidations": self.invalidations,
+                "size":          len(self._items),
+                "maxsize":       self.maxsize,
+            }
@@ -0,0 +1,291 @@
+import asyncio
+import atexit
+import logging
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+from . import transport
+from .batch import CHUNK_SIZE, _error
+from .transport import AsyncTransport, Transport
+
+logger = logging.getLogger("oc_skill.coalesce")
+
+
+def _merge(batch: Dict[str, Tuple[dict, list]], data: Dict[str, Any]) -> list:
+    """Fold ``data`` into the pending update for its id; returns its waiters."""
+    oid = str(data["id"])
+    if oid in batch:
+        merged, waiters = batch[oid]
+        merged.update(data)
+    else:
+        waiters = []
+        batch[oid] = (dict(data), waiters)
+    return waiters
+
+
+def _results(batch: Dict[str, Tuple[dict, list]], resp: Any) -> Dict[str, Any]:
+    """Per-id result in the shape a single update returns: a one-item list."""
+    by_id = ({str(o.get("id")): o for o in resp if isinstance(o, dict)}
+             if isinstance(resp, list) else {})
+    return {oid: [by_id[oid]] if oid in by_id else resp for oid in batch}
+
+
+def _settle(batch: Dict[str, Tuple[dict, list]], resp: Any) -> None:
+    results = _results(batch, resp)
+    for oid, (_, waiters) in batch.items():
+        for fut in waiters:
+            if not fut.done():
+                fut.set_result(results[oid])
+
+
+def _fail(batch: Dict[str, Tuple[dict, list]], exc: BaseException) -> None:
+    for _, waiters in batch.values():
+        for fut in waiters:
+            if not fut.done():
+                fut.set_exception(exc)
+
+
+class WriteCoalescer:
+    """Write-behind queue for ``/…/update/`` POSTs on one Transport.
+
+    Updates submitted within ``window`` seconds of the first pending one
+    are merged per id (later fields win) and sent as one list POST per
+    path. Each submit() returns a Future that resolves to that id's result,
+    or to the POST's exception. If a merged POST fails, each id is re-sent
+    alone, so one rejected update does not fail the others' callers. A path
+    flushes early once CHUNK_SIZE ids are pending.
+    """
+
+    def __init__(self, http: Transport, window: float) -> None:
+        self.http = http
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Tuple[dict, List[Future]]]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+
+    def submit(self, path: str, data: Dict[str, Any]) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            batch = self._pending.setdefault(path, {})
+            _merge(batch, data).append(fut)
+            full = len(batch) >= CHUNK_SIZE
+            if not full and path not in self._timers:
+                timer = threading.Timer(self.window, self.flush, (path,))
+                timer.daemon = True
+                self._timers[path] = timer
+                timer.start()
+        if full:
+            self.flush(path)
+        return fut
+
+    def flush(self, path: str) -> None:
+        with self._lock:
+            batch = self._pending.pop(path, {})
+            timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        if not batch:
+            return
+        try:
+            resp = self.http.post(path, [merged for merged, _ in batch.values()])
+        except Exception as exc:
+            if len(batch) == 1:
+                _fail(batch, exc)
+                return
+            logger.info("merged %s POST of %d ids failed (%s); sending each alone",
+                        path, len(batch), exc)
+            for oid, one in batch.items():
+                try:
+                    resp = self.http.post(path, [one[0]])
+                except Exception as exc:
+                    _fail({oid: one}, exc)
+                else:
+                    _settle({oid: one}, resp)
+            return
+        except BaseException as exc:
+            _fail(batch, exc)
+            return
+        _settle(batch, resp)
+
+    def flush_all(self) -> None:
+        with self._lock:
+            paths = list(self._pending)
+        for path in paths:
+            self.flush(path)
+
+
+class AsyncWriteCoalescer:
+    """asyncio form of WriteCoalescer; flushes on the transport's loop."""
+
+    def __init__(self, http: AsyncTransport, window: float) -> None:
+        self.http = http
+        self.window = window
+        self._pending: Dict[str, Dict[str, Tuple[dict, List[asyncio.Future]]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+    def _spawn(self, path: str) -> None:
+        task = asyncio.get_running_loop().create_task(self.flush(path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def submit(self, path: str, data: Dict[str, Any]) -> "asyncio.Future[Any]":
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        batch = self._pending.setdefault(path, {})
+        _merge(batch, data).append(fut)
+        if len(batch) >= CHUNK_SIZE:
+            self._spawn(path)
+        elif path not in self._timers:
+            self._timers[path] = loop.call_later(self.window, self._spawn, path)
+        return fut
+
+    async def flush(self, path: str) -> None:
+        batch = self._pending.pop(path, {})
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        if not batch:
+            return
+        try:
+            resp = await self.http.post(path, [merged for merged, _ in batch.values()])
+        except Exception as exc:
+            if len(batch) == 1:
+                _fail(batch, exc)
+                return
+            logger.info("merged %s POST of %d ids failed (%s); sending each alone",
+                        path, len(batch), exc)
+            for oid, one in batch.items():
+                try:
+                    resp = await self.http.post(path, [one[0]])
+                except Exception as exc:
+                    _fail({oid: one}, exc)
+                else:
+                    _settle({oid: one}, resp)
+            return
+        _settle(batch, resp)
+
+
+_LOCK = threading.Lock()
+_COALESCERS: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+
+def coalescer(http: Any) -> Any:
+    """The write-behind queue bound to ``http``, created on first use."""
+    with _LOCK:
+        queue = _COALESCERS.get(http)
+        if queue is None or queue.window != transport.WRITE_BEHIND:
+            cls = AsyncWriteCoalescer if isinstance(http, AsyncTransport) else WriteCoalescer
+            queue = _COALESCERS[http] = cls(http, transport.WRITE_BEHIND)
+        return queue
+
+
+def update_later(http: Transport, path: str, data: Dict[str, Any]) -> Future:
+    """Queue an update and return its Future; sent at once if write-behind is off."""
+    if transport.WRITE_BEHIND > 0 and data.get("id") is not None:
+        return coalescer(http).submit(path, data)
+    fut: Future = Future()
+    try:
+        fut.set_result(http.post(path, [data]))
+    except Exception as exc:
+        fut.set_exception(exc)
+    return fut
+
+
+def update(http: Transport, path: str, data: Dict[str, Any]) -> Any:
+    """POST one update, through the write-behind queue when it is enabled."""
+    if transport.WRITE_BEHIND > 0 and data.get("id") is not None:
+        return coalescer(http).submit(path, data).result()
+    return http.post(path, [data])
+
+
+async def aupdate(http: AsyncTransport, path: str, data: Dict[str, Any]) -> Any:
+    """asyncio form of update."""
+    if transport.WRITE_BEHIND > 0 and data.get("id") is not None:
+        return await coalescer(http).submit(path, data)
+    return await http.post(path, [data])
+
+
+# Tool-level update_later calls return at once; their futures wait here,
+# per transport, until a flush action reports them.
+_QUEUED: "weakref.WeakKeyDictionary[Any, list]" = weakref.WeakKeyDictionary()
+
+
+def _queued(http: Any, path: str, data: Dict[str, Any], fut: Any) -> Dict[str, Any]:
+    with _LOCK:
+        _QUEUED.setdefault(http, []).append((path, data.get("id"), fut))
+    return {"queued": data.get("id"), "window_ms": transport.WRITE_BEHIND * 1000}
+
+
+def _take(http: Any, path: str) -> list:
+    with _LOCK:
+        items = _QUEUED.get(http) or []
+        _QUEUED[http] = [q for q in items if q[0] != path]
+    return [q for q in items if q[0] == path]
+
+
+def _report(outcomes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    failed = sum(1 for r in outcomes if not r["ok"])
+    return {"ok": len(outcomes) - failed, "failed": failed, "results": outcomes}
+
+
+def queue(http: Transport, path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Tool form of update_later: queue without waiting; flush() reports it.
+
+    Lets separate tool calls within the window merge into one POST.
+    """
+    return _queued(http, path, data, update_later(http, path, data))
+
+
+def flush(http: Transport, path: str) -> Dict[str, Any]:
+    """Send ``path``'s pending updates now; per-id results of queued ones."""
+    pending = _COALESCERS.get(http)
+    if isinstance(pending, WriteCoalescer):
+        pending.flush(path)
+    outcomes = []
+    for _, oid, fut in _take(http, path):
+        try:
+            outcomes.append({"id": oid, "ok": True, "result": fut.result()})
+        except Exception as exc:
+            outcomes.append({"id": oid, "ok": False, "error": _error(exc)})
+    return _report(outcomes)
+
+
+async def aqueue(http: AsyncTransport, path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """asyncio form of queue."""
+    if transport.WRITE_BEHIND > 0 and data.get("id") is not None:
+        fut = coalescer(http).submit(path, data)
+    else:
+        fut = asyncio.get_running_loop().create_future()
+        try:
+            fut.set_result(await http.post(path, [data]))
+        except Exception as exc:
+            fut.set_exception(exc)
+    return _queued(http, path, data, fut)
+
+
+async def aflush(http: AsyncTransport, path: str) -> Dict[str, Any]:
+    """asyncio form of flush."""
+    pending = _COALESCERS.get(http)
+    if isinstance(pending, AsyncWriteCoalescer):
+        await pending.flush(path)
+    outcomes = []
+    for _, oid, fut in _take(http, path):
+        try:
+            outcomes.append({"id": oid, "ok": True, "result": await fut})
+        except Exception as exc:
+            outcomes.append({"id": oid, "ok": False, "error": _error(exc)})
+    return _report(outcomes)
+
+
+def flush_all() -> None:
+    """Send every pending sync update now (also runs at exit)."""
+    with _LOCK:
+        queues = [q for q in _COALESCERS.values() if isinstance(q, WriteCoalescer)]
+    for queue in queues:
+        queue.flush_all()
+
+
+atexit.register(flush_all)
@@ -1,19 +1,26 @@
-from typing import Literal, Any, Dict
+from concurrent.futures import Future
+from typing import Literal, Any, AsyncIterator, Dict, Iterator, Optional, Sequence
 import logging
 
-from .transport import Transport
-from .skill import SkillBase
+from . import coalesce
+from .transport import get_async_transport, get_transport
+from .skill import AsyncSkillBase, SkillBase, validated
+from .batch import amutate_many, aread_many, mutate_many, read_many
+from .poll import await_ready, wait_ready
 
 logger = logging.getLogger("oc_skill.domain")
 
 
 class DomainAPI:
     def __init__(self, token: str) -> None:
-        self.http = Transport(token=token)
+        self.http = get_transport(token)
 
     def list(self) -> list:
         return self.http.get("/domain/list/")
 
+    def iter_list(self, fields: Optional[Sequence[str]] = None) -> Iterator[dict]:
+        return self.http.iter_list("/domain/list/", fields=fields)
+
     def read(self, data: Dict[str, Any]) -> dict:
         return self.http.get(f"/domain/read/{data['id']}")
 
@@ -21,16 +28,44 @@ class DomainAPI:
         return self.http.post("/domain/create/", [data])
 
     def update(self, data: Dict[str, Any]) -> dict:
-        return self.http.post("/domain/update/", [data])
+        return coalesce.update(self.http, "/domain/update/", data)
+
+    def update_later(self, data: Dict[str, Any]) -> Future:
+        """Queue an update; with write-behind on, merged with others for the same id."""
+        return coalesce.update_later(self.http, "/domain/update/", data)
+
+    def queue_update(self, data: Dict[str, Any]) -> dict:
+        return coalesce.queue(self.http, "/domain/update/", data)
+
+    def flush_updates(self, data: Any = None) -> dict:
+        return coalesce.flush(self.http, "/domain/update/")
 
     def delete(self, data: Dict[str, Any]) -> Any:
         return self.http.post("/domain/delete/", [data])
 
+    def create_many(self, data: Any) -> dict:
+        return mutate_many(self.http, "/domain/create/", data)
+
+    def update_many(self, data: Any) -> dict:
+        return mutate_many(self.http, "/domain/update/", data)
+
+    def delete_many(self, data: Any) -> dict:
+        return mutate_many(self.http, "/domain/delete/", data)
+
+    def read_many(self, data: Any) -> dict:
+        return read_many(self.http, "/domain/read/{id}", data)
+
+    def wait_ready(self, data: Any) -> dict:
+        return wait_ready(self.http, "/domain/list/", data)
+
 
 class DomainTools(SkillBase):
+    @validated
     def domain(
         self,
-        action: Literal["list", "read", "create", "update", "delete"],
+        action: Literal["list", "read", "create", "update", "delete",
+                        "read_many", "create_many", "update_many", "delete_many",
+                        "wait_ready", "update_later", "flush"],
         payload: Any | None = None,
     ):
         """---
@@ -45,9 +80,9 @@ class DomainTools(SkillBase):
             properties:
                 action:
                     type: string
-                    enum: [list, read, create, update, delete]
+                    enum: [list, read, read_many, create, update, delete, create_many, update_many, delete_many, wait_ready, update_later, flush]
                 payload:
-                    type: [object, "null"]
+                    type: [object, array, "null"]
             required: [action]
 
         actions:
@@ -79,13 +114,144 @@ class DomainTools(SkillBase):
                     required: [id]
                     properties:
                         id: { type: string, format: uuid }
+            read_many:
+                summary: Fetch many domains by UUID concurrently; per-id results in input order.
+                payload:
+                    required: [ids]
+                    properties:
+                        ids:         { type: array, items: { type: string, format: uuid } }
+                        max_workers: { type: integer, default: 8 }
+            create_many:
+                summary: Create many domains in chunked list POSTs; per-item results.
+                payload:
+                    required: [items]
+                    properties:
+                        items:       { type: array, items: { type: object }, description: "domain create payloads" }
+                        chunk_size:  { type: integer, default: 50 }
+                        concurrency: { type: integer, default: 1 }
+            update_many:
+                summary: Update many domains in chunked list POSTs; per-item results.
+                payload:
+                    required: [items]
+                    properties:
+                        items:       { type: array, items: { type: object }, description: "domain update payloads with id" }
+                        chunk_size:  { type: integer, default: 50 }
+                        concurrency: { type: integer, default: 1 }
+                        retry:       { type: boolean, default: false, description: "Retry transient 5xx/connection errors." }
+            delete_many:
+                summary: Delete many domains in chunked list POSTs; per-item results.
+                payload:
+                    required: [items]
+                    properties:
+                        items:       { type: array, items: { type: object }, description: "objects with id" }
+                        chunk_size:  { type: integer, default: 50 }
+                        concurrency: { type: integer, default: 1 }
+                        retry:       { type: boolean, default: false, description: "Retry transient 5xx/connection errors." }
+            wait_ready:
+                summary: Poll until the given domains report ready, one list call per round.
+                payload:
+                    required: [ids]
+                    properties:
+                        ids:          { type: array, items: { type: string, format: uuid } }
+                        timeout:      { type: number, default: 300 }
+                        interval:     { type: number, default: 1 }
+                        max_interval: { type: number, default: 15 }
+            update_later:
+                summary: Queue an update and return at once. With write-behind on, updates within the window merge into one POST; flush reports the results.
+                payload:
+                    required: [id]
+                    properties:
+                        id: { type: string, format: uuid }
+            flush:
+                summary: Send queued updates now; per-id results of every update_later since the last flush.
+                payload: null
         ...
         """
         api = DomainAPI(token=self._token())
         return {
-            "list":   lambda _: api.list(),
-            "read":   api.read,
-            "create": api.create,
-            "update": api.update,
-            "delete": api.delete,
+            "list":         lambda _: api.list(),
+            "read":         api.read,
+            "create":       api.create,
+            "update":       api.update,
+            "delete":       api.delete,
+            "create_many":  api.create_many,
+            "update_many":  api.update_many,
+            "delete_many":  api.delete_many,
+            "read_many":    api.read_many,
+            "wait_ready":   api.wait_ready,
+            "update_later": api.queue_update,
+            "flush":        api.flush_updates,
         }[action](payload or {})
+
+
+class AsyncDomainAPI:
+    def __init__(self, token: str) -> None:
+        self.http = get_async_transport(token)
+
+    async def list(self) -> list:
+        return await self.http.get("/domain/list/")
+
+    def iter_list(self, fields: Optional[Sequence[str]] = None) -> AsyncIterator[dict]:
+        return self.http.iter_list("/domain/list/", fields=fields)
+
+    async def read(self, data: Dict[str, Any]) -> dict:
+        return await self.http.get(f"/domain/read/{data['id']}")
+
+    async def create(self, data: Dict[str, Any]) -> dict:
+        return await self.http.post("/domain/create/", [data])
+
+    async def update(self, data: Dict[str, Any]) -> dict:
+        return await coalesce.aupdate(self.http, "/domain/update/", data)
+
+    async def queue_update(self, data: Dict[str, Any]) -> dict:
+        return await coalesce.aqueue(self.http, "/domain/update/", data)
+
+    async def flush_updates(self, data: Any = None) -> dict:
+        return await coalesce.aflush(self.http, "/domain/update/")
+
+    async def delete(self, data: Dict[str, Any]) -> Any:
+        return await self.http.post("/domain/delete/", [data])
+
+    async def create_many(self, data: Any) -> dict:
+        return await amutate_many(self.http, "/domain/create/", data)
+
+    async def update_many(self, data: Any) -> dict:
+        return await amutate_many(self.http, "/domain/update/", data)
+
+    async def delete_many(self, data: Any) -> dict:
+        return await amutate_many(self.http, "/domain/delete/", data)
+
+    async def read_many(self, data: Any) -> dict:
+        return await aread_many(self.http, "/domain/read/{id}", data)
+
+    async def wait_ready(self, data: Any) -> dict:
+        return await await_ready(self.http, "/domain/list/", data)
+
+
+class AsyncDomainTools(AsyncSkillBase):
+    @validated
+    async def domain(
+        self,
+        action: Literal["list", "read", "create", "update", "delete",
+                        "read_many", "create_many", "update_many", "delete_many",
+                        "wait_ready", "update_later", "flush"],
+        payload: Any | None = None,
+    ):
+        api = AsyncDomainAPI(token=self._token())
+        return await {
+            "list":         lambda _: api.list(),
+            "read":         api.read,
+            "create":       api.create,
+            "update":       api.update,
+            "delete":       api.delete,
+            "create_many":  api.create_many,
+            "update_many":  api.update_many,
+            "delete_many":  api.delete_many,
+            "read_many":    api.read_many,
+            "wait_ready":   api.wait_ready,
+            "update_later": api.queue_update,
+            "flush":        api.flush_updates,
+        }[action](payload or {})
+
+
+AsyncDomainTools.domain.__doc__ = DomainTools.domain.__doc__
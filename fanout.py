@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from importlib import import_module
+from typing import Literal, Any, Dict, List, Optional
+import json
+import logging
+import os
+import time
+
+from . import manifest
+from .batch import _error
+from .resilience import bind, deadline
+from .skill import SkillBase, validated
+
+logger = logging.getLogger("oc_skill.fanout")
+
+MAX_WORKERS = 8
+
+
+def load_accounts() -> Dict[str, str]:
+    """Named tokens: OPALSTACK_API_TOKENS="acme=tok1,beta=tok2" and/or
+    OPALSTACK_API_TOKENS_FILE pointing at a JSON object {name: token}."""
+    accounts: Dict[str, str] = {}
+    path = os.getenv("OPALSTACK_API_TOKENS_FILE")
+    if path:
+        with open(os.path.expanduser(path), encoding="utf-8") as f:
+            accounts.update({str(k): str(v) for k, v in json.load(f).items()})
+    for part in os.getenv("OPALSTACK_API_TOKENS", "").split(","):
+        name, sep, token = part.strip().partition("=")
+        if sep and name and token:
+            accounts[name.strip()] = token.strip()
+    return accounts
+
+
+def tool_method(name: str) -> Any:
+    """Resolve a tool name from the manifest ("applications", ...) to (class, method)."""
+    for entry in manifest.load()["tools"]:
+        if entry["name"] == name:
+            cls = getattr(import_module(entry["module"]), entry["class"])
+            return cls, entry["method"]
+    raise ValueError(f"unknown tool {name!r}")
+
+
+class FanoutAPI:
+    def __init__(self, accounts: Optional[Dict[str, str]] = None) -> None:
+        self.accounts = load_accounts() if accounts is None else accounts
+        if not self.accounts:
+            raise RuntimeError("no accounts: set OPALSTACK_API_TOKENS or OPALSTACK_API_TOKENS_FILE")
+
+    def names(self, data: Dict[str, Any]) -> List[str]:
+        return sorted(self.accounts)
+
+    def run(self, data: Dict[str, Any]) -> dict:
+        """Run one tool action for every selected account concurrently.
+
+        Each account gets its own tool instance and pooled transport; an
+        exception in one account is recorded under that account only.
+        """
+        names = data.get("accounts") or sorted(self.accounts)
+        unknown = [n for n in names if n not in self.accounts]
+        if unknown:
+            raise ValueError(f"unknown accounts: {unknown}")
+        cls, method = tool_method(data["tool"])
+        action, payload = data["action"], data.get("payload")
+
+        def one(name: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                tool = cls(token=self.accounts[name])
+                out = {"ok": True, "result": getattr(tool, method)(action, payload)}
+            except Exception as exc:
+                logger.warning("fan-out %s.%s failed for %s: %s", data["tool"], action, name, exc)
+                out = {"ok": False, "error": _error(exc)}
+                if getattr(exc, "status", None) is not None:
+                    out["status"] = exc.status
+            out["elapsed"] = round(time.perf_counter() - started, 3)
+            return out
+
+        workers = min(len(names), max(1, int(data.get("max_workers") or MAX_WORKERS))) or 1
+        budget = data.get("deadline")
+        with deadline(float(budget)) if budget else nullcontext():
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = dict(zip(names, pool.map(bind(one), names)))
+        failed = sum(1 for r in results.values() if not r["ok"])
+        return {"ok": len(results) - failed, "failed": failed, "accounts": results}
+
+
+class FanoutTools(SkillBase):
+    @validated
+    def fanout(
+        self,
+        action: Literal["accounts", "run"],
+        payload: Any | None = None,
+    ):
+        """---
+        name: fanout
+        description: |
+            Runs one action of another tool across many Opalstack accounts
+            at once. Accounts are named tokens from OPALSTACK_API_TOKENS
+            ("name=token,...") or OPALSTACK_API_TOKENS_FILE (JSON object).
+            Results are keyed by account name; a failing account never
+            fails the others. Tokens are never returned.
+
+        parameters:
+            type: object
+            properties:
+                action:
+                    type: string
+                    enum: [accounts, run]
+                payload:
+                    type: [object, "null"]
+            required: [action]
+
+        actions:
+            accounts:
+                summary: Names of the configured accounts.
+                payload: null
+            run:
+                summary: Run tool/action/payload for every (or the listed) account concurrently.
+                payload:
+                    required: [tool, action]
+                    properties:
+                        tool:        { type: string, enum: [applications, domains, mariadbs, psqldbs, osusers, inventory, snapshot, topology, stack] }
+                        action:      { type: string }
+                        payload:     { type: [object, array, "null"] }
+                        accounts:    { type: array, items: { type: string }, description: "Default: all accounts." }
+                        max_workers: { type: integer, default: 8 }
+                        deadline:    { type: number, description: "Seconds for the whole fan-out; accounts still waiting fail with DeadlineExceeded." }
+        ...
+        """
+        api = FanoutAPI()
+        return {
+            "accounts": api.names,
+            "run":      api.run,
+        }[action](payload or {})
@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .transport import AsyncTransport, Transport
+
+logger = logging.getLogger("oc_skill.installers")
+
+# ── installer catalogue (static, mirrors opalstack/installers on GitHub) ──────
+INSTALLERS = [
+    {"selected_type": "wordpress",  "name": "WordPress",         "app_type": "NPF",
+     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/wordpress/install.sh",
+             "el9": "https://raw.githubusercontent.com/opalstack/installers/refs/heads/master/el9/wordpress/install.sh"},
+     "json": {"auto_site_url": True, "fpm_max_requests": 250, "fpm_max_children": 25, "php_version": 83, "gzip": True, "expires": "off"}},
+    {"selected_type": "laravel",    "name": "Laravel",           "app_type": "NPF",
+     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/laravel/install.py",
+             "el9": "https://raw.githubusercontent.com/opalstack/installers/master/el9/laravel/install.py"},
+     "json": {"fpm_max_requests": 250, "fpm_max_children": 25, "gzip": True, "php_version": 83, "subroot": "project/public", "expires": "off"}},
+    {"selected_type": "nextjs",     "name": "Next.js",           "app_type": "CUS",
+     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/nextjs/install.py",
+             "el9": "https://raw.githubusercontent.com/opalstack/installers/master/el9/nextjs/install.py"},
+     "json": {"gzip": True, "expires": "off"}},
+    {"selected_type": "ghost",      "name": "Ghost",             "app_type": "CUS",
+     "url": {"el7": "https://raw.githubusercontent.com/opalstack/installers/master/core/ghost/install.py",
+             "el9": "https://raw.githubusercontent.com/opalstack/installers/refs/heads/master/el9/ghost/install.py"},
+     "json": {"gzip": True, "expires": "off"}},
+    {"selected_type": "django",     "name": "Django",            "app_type": "CUS",
+     "url": {"el9": "https://raw.githubusercontent.com/opalstack/installers/master/el9/django/install.py"},
+     "json": {"gzip": True, "expires": "off"}},
+    {"selected_type": "static_only","name": "Nginx Static Only", "app_type": "STA",
+     "url": {},
+     "json": {"gzip": True, "expires": "off"}},
+]
+
+# OS assumed when the server record does not say; all current servers are el9.
+DEFAULT_OS = "el9"
+
+# "el9", "centos7", "CentOS Linux 7", "Rocky 9", "AlmaLinux 9" -> el7 / el9
+_OS_RE = re.compile(r"\b(?:el|rhel|centos|rocky|alma(?:linux)?)(?:\s*linux)?[\s_-]*(\d+)", re.I)
+_OS_KEYS = ("os", "os_version", "distro", "platform", "image", "type", "hostname")
+
+
+class Catalogue:
+    """The installer list indexed by ``selected_type`` and OS.
+
+    Entries come from INSTALLERS, overlaid by the optional JSON mirror file
+    (OPALSTACK_INSTALLERS_FILE: a list of entries of the same shape, or
+    ``{"installers": [...]}``); mirror entries replace built-ins with the same
+    ``selected_type`` and may add new ones. The file is re-read only when its
+    (mtime, size) changes; a broken file is logged and the last good index is
+    kept.
+    """
+
+    def __init__(self, builtin: List[dict], path: Optional[str] = None) -> None:
+        self.builtin = builtin
+        self.path = os.path.expanduser(path) if path else None
+        self.loads = 0
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._sig: Optional[Tuple[int, int]] = None
+        self._entries: List[dict] = []
+        self._by_type: Dict[str, dict] = {}
+        self._by_os: Dict[str, List[dict]] = {}
+        self._index(builtin)
+
+    def _index(self, entries: List[dict]) -> None:
+        by_type = {e["selected_type"]: e for e in entries}
+        by_os: Dict[str, List[dict]] = {}
+        for entry in by_type.values():
+            for tag in entry.get("url") or {}:
+                by_os.setdefault(tag, []).append(entry)
+        self._entries, self._by_type, self._by_os = list(by_type.values()), by_type, by_os
+
+    def _mirror(self) -> List[dict]:
+        with open(self.path, encoding="utf-8") as f:  # type: ignore[arg-type]
+            data = json.load(f)
+        items = data.get("installers") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise ValueError("expected a list of installers")
+        for i, item in enumerate(items):
+            if not isinstance(item, dict) or not item.get("selected_type") or not item.get("app_type"):
+                raise ValueError(f"installers[{i}] needs selected_type and app_type")
+            item.setdefault("name", item["selected_type"])
+            item.setdefault("url", {})
+            item.setdefault("json", {})
+        return items
+
+    def refresh(self) -> None:
+        """Re-index from the mirror file if it changed since the last look."""
+        if not self.path:
+            return
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            sig = None
+        else:
+            sig = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if sig == self._sig:
+                return
+            self._sig = sig
+            try:
+                mirror = self._mirror() if sig is not None else []
+            except (OSError, ValueError) as exc:
+                logger.warning("installer mirror %s ignored: %s", self.path, exc)
+                return
+            self._index(self.builtin + mirror)
+            self.loads += 1
+            self.loaded_at = time.time()
+
+    def entries(self, os_tag: Optional[str] = None) -> List[dict]:
+        """All installers, or those with a build for ``os_tag`` plus the URL-less ones."""
+        self.refresh()
+        if os_tag is None:
+            return self._entries
+        tagged = {id(e) for e in self._by_os.get(os_tag, ())}
+        return [e for e in self._entries if id(e) in tagged or not e.get("url")]
+
+    def get(self, selected_type: str) -> dict:
+        self.refresh()
+        entry = self._by_type.get(selected_type)
+        if entry is None:
+            raise ValueError(f"unknown installer {selected_type!r}; "
+                             f"known: {sorted(self._by_type)}")
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return {"count": len(self._entries), "mirror": self.path,
+                "loads": self.loads, "loaded_at": self.loaded_at}
+
+
+CATALOGUE = Catalogue(INSTALLERS, os.getenv("OPALSTACK_INSTALLERS_FILE"))
+
+
+def app_payload(entry: dict, os_tag: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """A ``/app/create/`` body for ``entry`` on ``os_tag``; caller fields win."""
+    urls = entry.get("url") or {}
+    if urls and os_tag not in urls:
+        raise ValueError(f"installer {entry['selected_type']!r} has no {os_tag} build "
+                         f"(available: {sorted(urls)})")
+    body: Dict[str, Any] = {"name": data.get("name") or entry["selected_type"],
+                            "osuser": data["osuser"], "type": entry["app_type"]}
+    if urls:
+        body["installer_url"] = urls[os_tag]
+    body["json"] = {**entry.get("json", {}), **(data.get("json") or {})}
+    return body
+
+
+def os_of(server: Any) -> Optional[str]:
+    """el7/el9 from a server record's OS-ish fields, or None if it does not say."""
+    if not isinstance(server, dict):
+        return None
+    for key in _OS_KEYS:
+        m = _OS_RE.search(str(server.get(key) or ""))
+        if m:
+            return f"el{m.group(1)}"
+    return None
+
+
+# An osuser never moves server and a server never changes OS, so both
+# lookups are kept for the life of the process.
+_LOCK = threading.Lock()
+_OSUSER_SERVER: Dict[str, str] = {}
+_SERVER_OS: Dict[str, Optional[str]] = {}
+
+
+def _result(entry: dict, data: Dict[str, Any], server: Optional[str],
+            found: Optional[str], source: str) -> Dict[str, Any]:
+    os_tag = data.get("os") or found or DEFAULT_OS
+    if data.get("os"):
+        source = "payload"
+    out: Dict[str, Any] = {"payload": app_payload(entry, os_tag, data),
+                           "os": os_tag, "os_source": source, "server": server}
+    if source == "assumed":
+        out["note"] = (f"server OS not reported by the API; assumed {DEFAULT_OS}. "
+                       f"Pass \"os\" to override.")
+    return out
+
+
+def _server_os(server: Optional[str]) -> Tuple[Optional[str], str]:
+    with _LOCK:
+        if server in _SERVER_OS:
+            found = _SERVER_OS[server]
+            return found, "server" if found else "assumed"
+    return None, ""
+
+
+def _remember(server: str, found: Optional[str],
+              exc: Optional[BaseException] = None) -> None:
+    # 403/404 (no such endpoint or server) will not change; other errors might.
+    if exc is None or getattr(exc, "status", None) in (403, 404):
+        with _LOCK:
+            _SERVER_OS[server] = found
+
+
+def resolve(http: Transport, data: Dict[str, Any]) -> Dict[str, Any]:
+    """installer type + osuser -> ready /app/create/ payload, via cached lookups."""
+    entry = CATALOGUE.get(data["type"])
+    if data.get("os"):
+        return _result(entry, data, None, None, "payload")
+    oid = data["osuser"]
+    with _LOCK:
+        server = _OSUSER_SERVER.get(oid)
+    if server is None:
+        server = http.get(f"/osuser/read/{oid}").get("server")
+        if server:
+            with _LOCK:
+                _OSUSER_SERVER[oid] = server
+    found, source = _server_os(server)
+    if not source and server:
+        try:
+            found = os_of(http.get(f"/server/read/{server}"))
+        except RuntimeError as exc:
+            logger.info("server %s lookup failed (%s); assuming %s", server, exc, DEFAULT_OS)
+            _remember(server, None, exc)
+        else:
+            _remember(server, found)
+        source = "server" if found else "assumed"
+    return _result(entry, data, server, found, source or "assumed")
+
+
+async def aresolve(http: AsyncTransport, data: Dict[str, Any]) -> Dict[str, Any]:
+    """asyncio form of resolve."""
+    entry = CATALOGUE.get(data["type"])
+    if data.get("os"):
+        return _result(entry, data, None, None, "payload")
+    oid = data["osuser"]
+    with _LOCK:
+        server = _OSUSER_SERVER.get(oid)
+    if server is None:
+        server = (await http.get(f"/osuser/read/{oid}")).get("server")
+        if server:
+            with _LOCK:
+                _OSUSER_SERVER[oid] = server
+    found, source = _server_os(server)
+    if not source and server:
+        try:
+            found = os_of(await http.get(f"/server/read/{server}"))
+        except RuntimeError as exc:
+            logger.info("server %s lookup failed (%s); assuming %s", server, exc, DEFAULT_OS)
+            _remember(server, None, exc)
+        else:
+            _remember(server, found)
+        source = "server" if found else "assumed"
+    return _result(entry, data, server, found, source or "assumed")
@@ -0,0 +1,280 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Any, Dict, List, Optional
+import logging
+import threading
+import time
+
+from . import transport
+from .resilience import bind
+from .transport import Transport, get_transport
+from .skill import SkillBase, validated
+from .snapshot import SnapshotStore
+
+logger = logging.getLogger("oc_skill.inventory")
+
+LISTS = {
+    "app":     "/app/list/",
+    "osuser":  "/osuser/list/",
+    "domain":  "/domain/list/",
+    "mariadb": "/mariadb/list/",
+    "psqldb":  "/psqldb/list/",
+}
+
+
+def fetch_all(http: Transport, fresh: bool = False) -> Dict[str, list]:
+    """GET all five resource lists concurrently over one pooled transport."""
+    with ThreadPoolExecutor(max_workers=len(LISTS)) as pool:
+        futures = {kind: pool.submit(bind(http.get), path, None, fresh)
+                   for kind, path in LISTS.items()}
+        return {kind: fut.result() for kind, fut in futures.items()}
+
+
+class Inventory:
+    """Hash indexes over one snapshot of the account's resource lists.
+
+    by_id:     id -> object (every object carries "kind")
+    by_name:   (kind, name) -> [ids]
+    by_server: server -> [ids]  (apps inherit their osuser's server)
+    by_osuser: osuser -> [app ids]
+    parent:    id -> parent id  (app -> osuser, osuser/db -> server)
+    children:  id -> [ids]
+    """
+
+    def __init__(self, lists: Dict[str, list]) -> None:
+        self.loaded_at = time.time()
+        self.by_id: Dict[str, dict] = {}
+        self.by_name: Dict[tuple, List[str]] = {}
+        self.by_server: Dict[str, List[str]] = {}
+        self.by_osuser: Dict[str, List[str]] = {}
+        self.parent: Dict[str, str] = {}
+        self.children: Dict[str, List[str]] = {}
+        for kind, objects in lists.items():
+            for obj in objects or []:
+                self.by_id[obj["id"]] = {**obj, "kind": kind}
+                self.by_name.setdefault((kind, obj.get("name")), []).append(obj["id"])
+        for oid, obj in self.by_id.items():
+            # an osuser missing from the lists (e.g. just deleted) is no parent
+            if obj.get("osuser") in self.by_id:
+                self.by_osuser.setdefault(obj["osuser"], []).append(oid)
+                self._link(obj["osuser"], oid)
+            server = obj.get("server") or self.by_id.get(obj.get("osuser"), {}).get("server")
+            if server:
+                self.by_server.setdefault(server, []).append(oid)
+                if not obj.get("osuser"):
+                    self._link(server, oid)
+
+    def _link(self, parent: str, child: str) -> None:
+        self.parent[child] = parent
+        self.children.setdefault(parent, []).append(child)
+
+    def counts(self) -> Dict[str, int]:
+        out: Dict[str, int] = {}
+        for obj in self.by_id.values():
+            out[obj["kind"]] = out.get(obj["kind"], 0) + 1
+        return out
+
+    def query(self, q: Dict[str, Any]) -> List[dict]:
+        """Intersect the filters in ``q``: kind, id, name, server, osuser, parent."""
+        if q.get("id"):
+            candidates: List[str] = [q["id"]] if q["id"] in self.by_id else []
+        elif q.get("name"):
+            kinds = [q["kind"]] if q.get("kind") else list(LISTS)
+            candidates = [i for k in kinds for i in self.by_name.get((k, q["name"]), [])]
+        elif q.get("osuser"):
+            candidates = self.by_osuser.get(q["osuser"], [])
+        elif q.get("server"):
+            candidates = self.by_server.get(q["server"], [])
+        elif q.get("parent"):
+            candidates = self.children.get(q["parent"], [])
+        else:
+            candidates = list(self.by_id)
+        out = []
+        for oid in candidates:
+            obj = self.by_id[oid]
+            if q.get("kind") and obj["kind"] != q["kind"]:
+                continue
+            if q.get("name") and obj.get("name") != q["name"]:
+                continue
+            if q.get("osuser") and obj.get("osuser") != q["osuser"]:
+                continue
+            if q.get("server") and oid not in self.by_server.get(q["server"], ()):
+                continue
+            if q.get("parent") and self.parent.get(oid) != q["parent"]:
+                continue
+            out.append(obj)
+        return out
+
+
+# One inventory per (token, base URL), shared by every tool instance.
+_LOCK = threading.Lock()
+_INVENTORIES: Dict[tuple, Inventory] = {}
+
+
+class InventoryAPI:
+    def __init__(self, token: str) -> None:
+        self.http = get_transport(token)
+
+    def load(self, max_age: Optional[float] = None) -> Inventory:
+        """Return the shared inventory, refreshing it if absent or too old."""
+        with _LOCK:
+            inv = _INVENTORIES.get(self.http.key)
+        if inv is None or (max_age is not None and time.time() - inv.loaded_at > max_age):
+            inv = self.refresh({})
+        return inv
+
+    def refresh(self, data: Dict[str, Any]) -> Inventory:
+        inv = Inventory(fetch_all(self.http, fresh=True))
+        with _LOCK:
+            _INVENTORIES[self.http.key] = inv
+        return inv
+
+    def summary(self, data: Dict[str, Any]) -> dict:
+        inv = self.load(data.get("max_age"))
+        return {"counts": inv.counts(), "age": round(time.time() - inv.loaded_at, 1)}
+
+    def query(self, data: Dict[str, Any]) -> dict:
+        inv = self.load(data.get("max_age"))
+        results = inv.query(data)
+        return {"count": len(results), "results": results,
+                "age": round(time.time() - inv.loaded_at, 1)}
+
+
+class InventoryTools(SkillBase):
+    @validated
+    def inventory(
+        self,
+        action: Literal["refresh", "summary", "query"],
+        payload: Any | None = None,
+    ):
+        """---
+        name: inventory
+        description: |
+            Answers lookups from an in-memory index of the account's apps,
+            OS users, domains, MariaDB and PostgreSQL databases.
+            The five lists are fetched concurrently on first use or on
+            "refresh"; queries never touch the network until then.
+            Use instead of calling "list" and scanning the result.
+
+        parameters:
+            type: object
+            properties:
+                action:
+                    type: string
+                    enum: [refresh, summary, query]
+                payload:
+                    type: [object, "null"]
+            required: [action]
+
+        actions:
+            refresh:
+                summary: Re-fetch all five lists and rebuild the index.
+                payload: null
+            summary:
+                summary: Object counts per kind and index age in seconds.
+                payload:
+                    properties:
+                        max_age: { type: number, description: "Refresh first if the index is older (seconds)." }
+            query:
+                summary: Objects matching every given filter, e.g. apps of an osuser or databases on a server.
+                payload:
+                    properties:
+                        kind:    { type: string, enum: [app, osuser, domain, mariadb, psqldb] }
+                        id:      { type: string, format: uuid }
+                        name:    { type: string }
+                        server:  { type: string, format: uuid }
+                        osuser:  { type: string, format: uuid }
+                        parent:  { type: string, format: uuid, description: "Direct children of this id." }
+                        max_age: { type: number }
+        ...
+        """
+        api = InventoryAPI(token=self._token())
+        return {
+            "refresh": lambda p: api.refresh(p).counts(),
+            "summary": api.summary,
+            "query":   api.query,
+        }[action](payload or {})
+
+
+class SnapshotAPI:
+    def __init__(self, token: str) -> None:
+        self.http = get_transport(token)
+        self.store: Optional[SnapshotStore] = transport.SNAPSHOT
+        if self.store is None:
+            raise RuntimeError("snapshot store not configured: set OPALSTACK_SNAPSHOT")
+
+    def sync(self, data: Dict[str, Any]) -> dict:
+        """Stream each live list and rewrite only rows whose hash changed."""
+        kinds = data.get("resources") or list(LISTS)
+
+        def one(kind: str) -> Dict[str, int]:
+            since = time.time()
+            live = list(self.http.iter_list(LISTS[kind]))
+            return self.store.sync(self.http.account, self.http.base_url, kind, live, since)
+
+        with ThreadPoolExecutor(max_workers=len(kinds)) as pool:
+            futures = {kind: pool.submit(bind(one), kind) for kind in kinds}
+            return {kind: fut.result() for kind, fut in futures.items()}
+
+    def status(self, data: Dict[str, Any]) -> dict:
+        return self.store.status(self.http.account, self.http.base_url)
+
+    def list(self, data: Dict[str, Any]) -> list:
+        """Stored rows for one resource; works offline, however old."""
+        max_age = data.get("max_age")
+        rows = self.store.read(self.http.account, self.http.base_url,
+                               data["resource"],
+                               float("inf") if max_age is None else max_age)
+        if rows is None:
+            raise RuntimeError(f"no fresh snapshot of {data['resource']}; run sync")
+        return rows
+
+
+class SnapshotTools(SkillBase):
+    @validated
+    def snapshot(
+        self,
+        action: Literal["sync", "status", "list"],
+        payload: Any | None = None,
+    ):
+        """---
+        name: snapshot
+        description: |
+            Local SQLite snapshot of the app, domain, osuser, mariadb and
+            psqldb lists (path from OPALSTACK_SNAPSHOT). While a snapshot is
+            fresh, every tool's "list" is answered from it, and it is used
+            when the API is unreachable. Mutations mark a resource stale.
+
+        parameters:
+            type: object
+            properties:
+                action:
+                    type: string
+                    enum: [sync, status, list]
+                payload:
+                    type: [object, "null"]
+            required: [action]
+
+        actions:
+            sync:
+                summary: Diff live lists against the snapshot and rewrite only changed rows.
+                payload:
+                    properties:
+                        resources: { type: array, items: { type: string, enum: [app, domain, osuser, mariadb, psqldb] } }
+            status:
+                summary: Row count, age and freshness per resource.
+                payload: null
+            list:
+                summary: Stored rows for one resource without a network call.
+                payload:
+                    required: [resource]
+                    properties:
+                        resource: { type: string, enum: [app, domain, osuser, mariadb, psqldb] }
+                        max_age:  { type: number, description: "Fail if older (seconds); default any age." }
+        ...
+        """
+        api = SnapshotAPI(token=self._token())
+        return {
+            "sync":   api.sync,
+            "status": api.status,
+            "list":   api.list,
+        }[action](payload or {})
@@ -0,0 +1,142 @@
+"""Precompiled tool-schema manifest.
+
+The hosts need each tool's schema, which lives in the YAML-ish ``---``
+docstrings. Reading those normally means importing every tool module (and
+``requests``). Instead, this module reads the docstrings straight from the
+module source with ``ast`` and caches the parsed schemas in
+``manifest.json``. The cache is rebuilt when any tool module's mtime or size
+changes.
+
+Build ahead of time (e.g. at install or image build) with::
+
+    python -m oc_skill.manifest
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+
+from . import REGISTRY
+from .schema import parse
+
+logger = logging.getLogger("oc_skill.manifest")
+
+VERSION = 1
+PACKAGE = __package__
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_LOCK = threading.Lock()
+_LOADED: Optional[Dict[str, Any]] = None
+
+
+def _source(module: str) -> str:
+    return os.path.join(HERE, module + ".py")
+
+
+def signature() -> Dict[str, List[int]]:
+    """(mtime_ns, size) of every module that carries a tool docstring, plus schema.py."""
+    out = {}
+    for module in sorted({m for _, m, _, _ in REGISTRY} | {"schema"}):
+        st = os.stat(_source(module))
+        out[module] = [st.st_mtime_ns, st.st_size]
+    return out
+
+
+def _docstring(module: str, cls: str, method: str) -> str:
+    import ast
+
+    with open(_source(module), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), _source(module))
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == cls:
+            for fn in node.body:
+                if isinstance(fn, (ast.FunctionDef, ast.AsyncFunctionDef)) and fn.name == method:
+                    return ast.get_docstring(fn, clean=False) or ""
+    raise LookupError(f"{module}.{cls}.{method} not found")
+
+
+def build() -> Dict[str, Any]:
+    """Parse every registered tool docstring without importing its module."""
+    sig = signature()
+    tools = []
+    for cls, module, method, async_cls in REGISTRY:
+        schema = parse(_docstring(module, cls, method))
+        tools.append({
+            "name":        schema.get("name", method),
+            "class":       cls,
+            "module":      f"{PACKAGE}.{module}",
+            "method":      method,
+            "async_class": async_cls,
+            "schema":      schema,
+        })
+    return {"version": VERSION, "signature": sig, "tools": tools}
+
+
+def paths() -> List[str]:
+    """Candidate manifest files: OPALSTACK_MANIFEST, the package dir, then the user cache."""
+    out = []
+    if os.getenv("OPALSTACK_MANIFEST"):
+        out.append(os.path.expanduser(os.environ["OPALSTACK_MANIFEST"]))
+    out.append(os.path.join(HERE, "manifest.json"))
+    cache = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    out.append(os.path.join(cache, "oc_skill", "manifest.json"))
+    return out
+
+
+def _read(path: str, sig: Dict[str, List[int]]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != VERSION or data.get("signature") != sig:
+        return None
+    return data
+
+
+def _write(data: Dict[str, Any]) -> Optional[str]:
+    """Atomically write to the first writable candidate path."""
+    for path in paths():
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path)
+            return path
+        except OSError as exc:
+            logger.debug("manifest not writable at %s: %s", path, exc)
+    return None
+
+
+def load() -> Dict[str, Any]:
+    """Cached manifest, rebuilt (and rewritten) if any tool module changed."""
+    global _LOADED
+    with _LOCK:
+        sig = signature()
+        if _LOADED is not None and _LOADED["signature"] == sig:
+            return _LOADED
+        for path in paths():
+            data = _read(path, sig)
+            if data is not None:
+                _LOADED = data
+                return data
+        data = build()
+        if _write(data) is None:
+            logger.warning("no writable location for the tool manifest; kept in memory")
+        _LOADED = data
+        return data
+
+
+def schemas() -> Dict[str, Dict[str, Any]]:
+    """Tool name -> parsed docstring schema."""
+    return {t["name"]: t["schema"] for t in load()["tools"]}
+
+
+if __name__ == "__main__":
+    written = _write(build())
+    print(written or "manifest not written: no writable location")
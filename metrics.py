@@ -0,0 +1,164 @@
+import bisect
+import logging
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("oc_skill.metrics")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+BUCKETS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_ID = re.compile(r"^(?:[0-9a-fA-F]{8}-?(?:[0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}|\d+)$")
+
+
+def template(path: str) -> str:
+    """'/app/read/<uuid>' -> '/app/read/{id}' so per-object paths aggregate."""
+    return "/".join("{id}" if _ID.match(seg) else seg for seg in path.split("/"))
+
+
+class Call:
+    """One logical request (all its attempts), handed to the hooks.
+
+    Start hooks may add to ``headers`` (sent with every attempt, e.g. a
+    trace context) and keep their own state in ``extra``, such as a span.
+    """
+
+    __slots__ = ("method", "path", "template", "started", "elapsed", "status",
+                 "error", "retries", "bytes_in", "bytes_out", "headers", "extra")
+
+    def __init__(self, method: str, path: str, bytes_out: int) -> None:
+        self.method = method
+        self.path = path
+        self.template = template(path)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = bytes_out
+        self.headers: Dict[str, str] = {}
+        self.extra: Dict[str, Any] = {}
+
+
+class _Endpoint:
+    __slots__ = ("count", "status", "hist", "total_ms", "max_ms",
+                 "bytes_in", "bytes_out", "retries")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.status: Dict[str, int] = {}
+        self.hist = [0] * (len(BUCKETS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+
+    def _quantile(self, q: float) -> float:
+        """Histogram estimate: the upper bound of the bucket holding quantile q."""
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.hist):
+            seen += n
+            if n and seen >= rank:
+                return min(BUCKETS[i], self.max_ms) if i < len(BUCKETS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b:g}" for b in BUCKETS] + ["inf"]
+        return {
+            "count":     self.count,
+            "status":    dict(self.status),
+            "mean_ms":   round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms":    round(self._quantile(0.50), 3),
+            "p90_ms":    round(self._quantile(0.90), 3),
+            "p99_ms":    round(self._quantile(0.99), 3),
+            "max_ms":    round(self.max_ms, 3),
+            "histogram": dict(zip(labels, self.hist)),
+            "bytes_in":  self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries":   self.retries,
+        }
+
+
+class Metrics:
+    """Per (method, path template) request counters, plus start/end hooks.
+
+    begin() and end() bracket every request a transport actually sends,
+    retries included; cache, snapshot and coalesced hits send nothing and
+    are not counted. Recording costs one lock and a few increments, and
+    stats() copies the counters without touching the hot path for long.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], _Endpoint] = {}
+        self._start_hooks: List[Callable[[Call], Any]] = []
+        self._end_hooks: List[Callable[[Call], Any]] = []
+        self.since = time.time()
+
+    def add_hook(self, start: Optional[Callable[[Call], Any]] = None,
+                 end: Optional[Callable[[Call], Any]] = None) -> Callable[[], None]:
+        """Register request start/end callbacks; returns a function that removes them."""
+        with self._lock:
+            if start is not None:
+                self._start_hooks = self._start_hooks + [start]
+            if end is not None:
+                self._end_hooks = self._end_hooks + [end]
+
+        def remove() -> None:
+            with self._lock:
+                self._start_hooks = [h for h in self._start_hooks if h is not start]
+                self._end_hooks = [h for h in self._end_hooks if h is not end]
+        return remove
+
+    @staticmethod
+    def _run(hooks: List[Callable[[Call], Any]], call: Call) -> None:
+        for hook in hooks:
+            try:
+                hook(call)
+            except Exception:
+                logger.exception("metrics hook %r failed", hook)
+
+    def begin(self, method: str, path: str, body: Any = None) -> Call:
+        call = Call(method, path, len(body) if isinstance(body, (str, bytes)) else 0)
+        if self._start_hooks:
+            self._run(self._start_hooks, call)
+        return call
+
+    def end(self, call: Call, status: Optional[int] = None, bytes_in: int = 0,
+            error: Optional[BaseException] = None) -> None:
+        call.elapsed = time.perf_counter() - call.started
+        call.status = status
+        call.error = error
+        call.bytes_in = bytes_in
+        ms = call.elapsed * 1000
+        key = str(status) if status is not None else type(error).__name__
+        with self._lock:
+            ep = self._endpoints.get((call.method, call.template))
+            if ep is None:
+                ep = self._endpoints[(call.method, call.template)] = _Endpoint()
+            ep.count += 1
+            ep.status[key] = ep.status.get(key, 0) + 1
+            ep.hist[bisect.bisect_left(BUCKETS, ms)] += 1
+            ep.total_ms += ms
+            ep.max_ms = max(ep.max_ms, ms)
+            ep.bytes_in += bytes_in
+            ep.bytes_out += call.bytes_out
+            ep.retries += call.retries
+        if self._end_hooks:
+            self._run(self._end_hooks, call)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """{"GET /app/read/{id}": {count, status, p50_ms, ..., retries}, ...}"""
+        with self._lock:
+            return {f"{m} {t}": ep.snapshot()
+                    for (m, t), ep in sorted(self._endpoints.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self.since = time.time()
@@ -0,0 +1,100 @@
+from typing import Any, Dict
+import asyncio
+import logging
+import time
+
+from .transport import AsyncTransport, Transport
+
+logger = logging.getLogger("oc_skill.poll")
+
+TIMEOUT = 300.0
+INTERVAL = 1.0
+MAX_INTERVAL = 15.0
+
+
+def _poll_args(data: Any) -> tuple[set, float, float, float]:
+    if isinstance(data, list):
+        data = {"ids": data}
+    return (set(data.get("ids") or []),
+            TIMEOUT if data.get("timeout") is None else float(data["timeout"]),
+            float(data.get("interval") or INTERVAL),
+            float(data.get("max_interval") or MAX_INTERVAL))
+
+
+class _Round:
+    """State shared by the sync and async pollers."""
+
+    def __init__(self, data: Any) -> None:
+        self.waiting, timeout, self.base, self.cap = _poll_args(data)
+        self.interval = self.base
+        self.ready: Dict[str, Any] = {}
+        self.missing: set = set()
+        self.polls = 0
+        self.t0 = time.monotonic()
+        self.deadline = self.t0 + timeout
+
+    def check(self, objects: list) -> None:
+        """One list response settles every id it reports as ready."""
+        self.polls += 1
+        by_id = {o.get("id"): o for o in objects if isinstance(o, dict)}
+        before = len(self.waiting)
+        for oid in list(self.waiting):
+            obj = by_id.get(oid)
+            if obj is None:
+                self.missing.add(oid)
+                continue
+            self.missing.discard(oid)
+            if obj.get("ready", True):
+                self.ready[oid] = obj
+                self.waiting.discard(oid)
+        # Progress: poll again soon. Nothing changed: back off.
+        if len(self.waiting) < before:
+            self.interval = self.base
+        else:
+            self.interval = min(self.cap, self.interval * 1.5)
+
+    def sleep_for(self) -> float:
+        """Seconds to sleep before the next round, or -1 when done."""
+        remaining = self.deadline - time.monotonic()
+        if not self.waiting or remaining <= 0:
+            return -1
+        return min(self.interval, remaining)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "done":    not self.waiting,
+            "ready":   self.ready,
+            "pending": sorted(self.waiting - self.missing),
+            "missing": sorted(self.waiting & self.missing),
+            "polls":   self.polls,
+            "elapsed": round(time.monotonic() - self.t0, 3),
+        }
+
+
+def wait_ready(http: Transport, list_path: str, data: Any) -> Dict[str, Any]:
+    """Poll ``list_path`` until every id reports ``ready`` or time runs out.
+
+    One list call per round covers all ids, instead of one read per id.
+    The interval grows by 1.5x while nothing changes and resets on progress.
+    """
+    rnd = _Round(data)
+    while rnd.waiting:
+        rnd.check(http.get(list_path, fresh=True))
+        wait = rnd.sleep_for()
+        if wait < 0:
+            break
+        time.sleep(wait)
+    return rnd.result()
+
+
+async def await_ready(http: AsyncTransport, list_path: str,
+                      data: Any) -> Dict[str, Any]:
+    """asyncio form of wait_ready with the same payload and result shape."""
+    rnd = _Round(data)
+    while rnd.waiting:
+        rnd.check(await http.get(list_path, fresh=True))
+        wait = rnd.sleep_for()
+        if wait < 0:
+            break
+        await asyncio.sleep(wait)
+    return rnd.result()
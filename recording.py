@@ -0,0 +1,96 @@
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("oc_skill.recording")
+
+VERSION = 1
+
+# Response headers kept; everything else (cookies, server banners) is dropped.
+HEADERS = ("Content-Type", "Retry-After")
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode, encoding="utf-8")
+
+
+class Recorder:
+    """Appends every request a Transport sends to a JSON-lines file.
+
+    One line per logical call (after retries): start offset ``t`` and
+    duration ``d`` in seconds, method, path, params, request body, status,
+    a few response headers and the response body. Network failures are
+    recorded as ``e`` (the exception class name). Request headers, and so
+    the token, are never written. A ``.gz`` path is gzip-compressed.
+    """
+
+    def __init__(self, path: str, base_url: str) -> None:
+        self.path = os.path.expanduser(path)
+        self.calls = 0
+        self.t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file: Optional[IO[str]] = _open(self.path, "w")
+        self._write({"v": VERSION, "base_url": base_url, "started": time.time()})
+        atexit.register(self.close)  # a gzip file needs its trailer
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+
+    def _entry(self, call: Any, method: str, path: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"t": round(call.started - self.t0, 6),
+                                 "d": round(call.elapsed, 6), "m": method, "p": path}
+        if kwargs.get("params"):
+            entry["q"] = kwargs["params"]
+        if kwargs.get("data") is not None:
+            entry["b"] = kwargs["data"]
+        if kwargs.get("stream"):
+            entry["st"] = 1
+        return entry
+
+    def record(self, call: Any, method: str, path: str, kwargs: Dict[str, Any],
+               resp: Any) -> None:
+        entry = self._entry(call, method, path, kwargs)
+        entry["s"] = resp.status_code
+        headers = {h: resp.headers[h] for h in HEADERS if h in resp.headers}
+        if headers:
+            entry["h"] = headers
+        # Reading a streamed body here buffers it; iter_content then replays
+        # the buffered bytes, so iter_list still works while recording.
+        entry["r"] = resp.content.decode("utf-8", "replace")
+        self.calls += 1
+        self._write(entry)
+
+    def record_error(self, call: Any, method: str, path: str, kwargs: Dict[str, Any],
+                     exc: BaseException) -> None:
+        entry = self._entry(call, method, path, kwargs)
+        entry["e"] = type(exc).__name__
+        self.calls += 1
+        self._write(entry)
+
+    def close(self) -> None:
+        with self._lock:
+            f, self._file = self._file, None
+        if f is not None:
+            f.close()
+
+
+def load(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(header, entries sorted by start offset) from a recording file."""
+    with _open(os.path.expanduser(path), "r") as f:
+        lines: Iterator[str] = (line for line in f if line.strip())
+        header = json.loads(next(lines))
+        if header.get("v") != VERSION:
+            raise ValueError(f"unsupported recording version {header.get('v')!r}")
+        entries = [json.loads(line) for line in lines]
+    entries.sort(key=lambda e: e["t"])
+    return header, entries
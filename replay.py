@@ -0,0 +1,262 @@
+"""Replay a recorded session through the real client stack, offline.
+
+Record with ``OPALSTACK_RECORD=session.jsonl.gz`` (or
+``transport.enable_recording(path)``); every Transport call is written with
+its timing. Replay re-issues the calls on their original schedule, sped up
+``--speed`` times, from ``--concurrency`` threads. A ReplayTransport is a
+Transport whose session answers from the recording, so retries, cache,
+coalescing, breakers and metrics all run as they would live. Each response
+waits its recorded duration times ``--latency`` (0 = instant).
+
+Reports per-call latency, client-side overhead (latency minus the simulated
+server time), schedule lag and throughput, as JSON for later comparison:
+
+    python -m oc_skill.replay session.jsonl.gz --speed 10 --concurrency 32
+    python -m oc_skill.replay session.jsonl.gz --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import transport
+from .bench import percentile
+from .recording import load
+from .resilience import bind
+from .transport import Transport
+
+logger = logging.getLogger("oc_skill.replay")
+
+TOKEN = "replay-token"
+
+
+def _key(method: str, path: str, params: Any, body: Any) -> tuple:
+    return (method, path, json.dumps(params, sort_keys=True) if params else "", body or "")
+
+
+def _response(status: int, body: str, url: str, headers: Optional[dict] = None) -> Any:
+    import requests
+
+    raw = body.encode()
+    r = requests.Response()
+    r.status_code = status
+    r.url = url
+    r.encoding = "utf-8"
+    r.headers.update(headers or {})
+    r.headers["Content-Length"] = str(len(raw))
+    r._content = raw
+    r._content_consumed = True
+    return r
+
+
+class ReplaySession:
+    """Stands in for ``requests.Session``: answers from recorded entries.
+
+    Identical requests are answered in recorded order; once a request's
+    recordings run out, the last one is reused, so a session can be looped.
+    A request that was never recorded gets a 404 and counts as a miss.
+    """
+
+    def __init__(self, entries: List[dict], base_url: str, latency: float = 1.0) -> None:
+        self.base_url = base_url
+        self.latency = latency
+        self.headers: Dict[str, str] = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._queues: Dict[tuple, Deque[dict]] = {}
+        self._last: Dict[tuple, dict] = {}
+        for e in entries:
+            key = _key(e["m"], e["p"], e.get("q"), e.get("b"))
+            self._queues.setdefault(key, deque()).append(e)
+
+    def served(self) -> float:
+        """Simulated server seconds on this thread since the last call; resets."""
+        spent = getattr(self._local, "served", 0.0)
+        self._local.served = 0.0
+        return spent
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+            self._local.served = getattr(self._local, "served", 0.0) + seconds
+
+    def request(self, method: str, url: str, timeout: Any = None, headers: Any = None,
+                params: Any = None, data: Any = None, **_: Any) -> Any:
+        import requests
+
+        key = _key(method, url[len(self.base_url):], params, data)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                entry: Optional[dict] = queue.popleft()
+                self._last[key] = entry  # type: ignore[assignment]
+            else:
+                entry = self._last.get(key)
+            if entry is None:
+                self.misses += 1
+        if entry is None:
+            return _response(404, '{"detail": "not in recording"}', url)
+        delay = entry["d"] * self.latency
+        read = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read is not None and delay > read:
+            self._wait(read)
+            raise requests.ReadTimeout(f"replayed {delay:.3f}s response exceeds read timeout")
+        self._wait(delay)
+        if "e" in entry:
+            exc = getattr(requests.exceptions, entry["e"], requests.ConnectionError)
+            raise exc(f"recorded {entry['e']}")
+        return _response(entry["s"], entry.get("r", ""), url, entry.get("h"))
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayTransport(Transport):
+    """A Transport whose wire is a recording (see ReplaySession)."""
+
+    def __init__(self, header: Dict[str, Any], entries: List[dict],
+                 latency: float = 1.0, token: str = TOKEN) -> None:
+        super().__init__(token, base_url=header["base_url"])
+        self.session.close()
+        self.session = ReplaySession(entries, self.base_url, latency)  # type: ignore[assignment]
+
+
+def _call(http: Transport, entry: dict) -> Any:
+    if entry["m"] == "GET":
+        if entry.get("st"):
+            return list(http.iter_list(entry["p"], entry.get("q")))
+        return http.get(entry["p"], entry.get("q"))
+    return http.post(entry["p"], json.loads(entry["b"]) if entry.get("b") else None)
+
+
+def _ms(values: List[float]) -> Dict[str, float]:
+    ms = [v * 1000 for v in values]
+    return {
+        "p50":  round(percentile(ms, 50), 3),
+        "p99":  round(percentile(ms, 99), 3),
+        "mean": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "max":  round(max(ms), 3) if ms else 0.0,
+    }
+
+
+def replay(path: str, speed: float = 1.0, concurrency: int = 8,
+           latency: float = 1.0) -> Dict[str, Any]:
+    """Re-issue a recording through a ReplayTransport; returns the summary.
+
+    ``speed`` divides the recorded start offsets (0 = all at once);
+    ``latency`` multiplies the recorded response times.
+    """
+    header, entries = load(path)
+    http = ReplayTransport(header, entries, latency)
+    session: ReplaySession = http.session  # type: ignore[assignment]
+    t0 = time.perf_counter()
+    first = entries[0]["t"] if entries else 0.0
+
+    def one(entry: dict, due: float) -> Tuple[float, float, float, bool]:
+        start = time.perf_counter()
+        session.served()
+        try:
+            _call(http, entry)
+            ok = True
+        except Exception:
+            ok = False
+        took = time.perf_counter() - start
+        return took, took - session.served(), start - due, ok
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = []
+        for entry in entries:
+            due = t0 + ((entry["t"] - first) / speed if speed > 0 else 0.0)
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            futures.append(pool.submit(bind(one), entry, due))
+        outcomes = [f.result() for f in futures]
+    wall = time.perf_counter() - t0
+    span = max((e["t"] + e["d"] for e in entries), default=first) - first
+    client = transport.stats()
+    client.pop("endpoints")
+    return {
+        "recording":       path,
+        "speed":           speed,
+        "concurrency":     concurrency,
+        "latency":         latency,
+        "calls":           len(outcomes),
+        "errors":          sum(not o[3] for o in outcomes),
+        "recorded_errors": sum(1 for e in entries if "e" in e or e.get("s", 200) >= 400),
+        "misses":          session.misses,
+        "wall_s":          round(wall, 3),
+        "recorded_s":      round(span, 3),
+        "rps":             round(len(outcomes) / wall, 1) if wall else 0.0,
+        "latency_ms":      _ms([o[0] for o in outcomes]),
+        "overhead_ms":     _ms([o[1] for o in outcomes]),
+        "lag_ms":          _ms([max(0.0, o[2]) for o in outcomes]),
+        "client":          client,
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any],
+            threshold: float) -> Tuple[List[str], bool]:
+    """Change in overhead, latency and throughput; True if any got worse by
+    more than ``threshold`` percent (and by at least 0.1 ms)."""
+    lines, worse = [f"{'metric':<16} {'old':>10} {'new':>10} {'change':>9}"], False
+    rows = [("overhead p50 ms", old["overhead_ms"]["p50"], new["overhead_ms"]["p50"], True),
+            ("overhead p99 ms", old["overhead_ms"]["p99"], new["overhead_ms"]["p99"], True),
+            ("latency p99 ms",  old["latency_ms"]["p99"],  new["latency_ms"]["p99"],  True),
+            ("calls/s",         old["rps"],                new["rps"],                False)]
+    for name, a, b, lower_is_better in rows:
+        change = (b - a) / a * 100 if a else 0.0
+        bad = (change > threshold and b - a >= 0.1) if lower_is_better else change < -threshold
+        worse = worse or bad
+        lines.append(f"{name:<16} {a:>10.3f} {b:>10.3f} {change:>+8.1f}%{'  !' if bad else ''}")
+    return lines, worse
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded oc_skill session offline.")
+    parser.add_argument("recording", help="file written with OPALSTACK_RECORD")
+    parser.add_argument("--speed", type=float, default=1.0, help="schedule speed-up; 0 = no pacing")
+    parser.add_argument("--concurrency", type=int, default=8, help="replay threads")
+    parser.add_argument("--latency", type=float, default=1.0,
+                        help="multiplier on recorded response times; 0 = instant")
+    parser.add_argument("--output", default="replay.json", help="JSON results file")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="percent; exit 1 if --compare finds a worse result")
+    parser.add_argument("--verbose", action="store_true", help="show retry/error logs")
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        logging.getLogger(__package__).setLevel(logging.CRITICAL)
+
+    try:
+        report = replay(args.recording, args.speed, args.concurrency, args.latency)
+    finally:
+        transport.shutdown()
+    print(f"{report['calls']} calls in {report['wall_s']}s "
+          f"(recorded {report['recorded_s']}s), {report['rps']} calls/s, "
+          f"{report['errors']} errors ({report['recorded_errors']} recorded), "
+          f"{report['misses']} misses")
+    for name in ("latency_ms", "overhead_ms", "lag_ms"):
+        print(f"{name:<12} " + "  ".join(f"{k} {v:.3f}" for k, v in report[name].items()))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            lines, worse = compare(json.load(f), report, args.max_regression)
+        print("\n".join(lines))
+        if worse:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Optional
+
+# ── per-call deadline ─────────────────────────────────────────────────────────
+
+_DEADLINE: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "oc_skill_deadline", default=None)
+
+
+class DeadlineExceeded(RuntimeError):
+    """The caller's deadline (see deadline()) passed before a response."""
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound every request made inside the block to ``seconds`` in total.
+
+    Nested deadlines keep the earlier one. Propagates to batch, inventory,
+    stack and fan-out worker threads and to asyncio tasks.
+    """
+    at = time.monotonic() + seconds
+    current = _DEADLINE.get()
+    token = _DEADLINE.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one."""
+    at = _DEADLINE.get()
+    return None if at is None else at - time.monotonic()
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap ``fn`` to run in a copy of the caller's context (deadline, etc.).
+
+    Executor threads do not inherit contextvars; each call gets its own copy
+    because one Context cannot be entered by two threads at once.
+    """
+    ctx = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> Any:
+        return ctx.copy().run(fn, *args, **kwargs)
+    return run
+
+
+# ── circuit breaker ───────────────────────────────────────────────────────────
+
+class CircuitOpenError(RuntimeError):
+    """Fail-fast while a base URL's circuit is open. ``args[0]`` is the payload."""
+
+    def __init__(self, base_url: str, retry_in: float) -> None:
+        super().__init__({"detail": f"circuit open for {base_url}",
+                          "retry_in": round(max(0.0, retry_in), 2)})
+        self.base_url = base_url
+
+
+class CircuitBreaker:
+    """closed -> open after ``failures`` consecutive failures; after
+    ``reset_timeout`` seconds one half-open probe is let through, which
+    closes the circuit on success or re-opens it on failure.
+
+    Failures are connection errors, timeouts and 5xx responses; 4xx and 429
+    mean the API is up and count as successes.
+    """
+
+    def __init__(self, base_url: str, failures: int = 5,
+                 reset_timeout: float = 30.0, probes: int = 1) -> None:
+        self.base_url = base_url
+        self.threshold = failures
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            wait_left = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == "open" and wait_left <= 0:
+                self.state = "half_open"
+            if self.state == "half_open" and self._probing < self.probes:
+                self._probing += 1
+                return
+        raise CircuitOpenError(self.base_url, wait_left)
+
+    def release(self) -> None:
+        """An allowed request ended without a verdict (e.g. the caller's deadline)."""
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = max(0, self._probing - 1)
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = max(0, self._probing - 1)
+            if ok:
+                self.state, self.failures = "closed", 0
+                return
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.trips += 1
+                self.state, self.opened_at = "open", time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "trips": self.trips}
+
+
+class Breakers:
+    """One CircuitBreaker per base URL."""
+
+    def __init__(self, failures: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._items: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["Breakers"]:
+        """OPALSTACK_BREAKER_FAILURES (default 5, 0 = off); OPALSTACK_BREAKER_RESET seconds."""
+        failures = int(os.getenv("OPALSTACK_BREAKER_FAILURES", "5"))
+        if failures <= 0:
+            return None
+        return cls(failures, float(os.getenv("OPALSTACK_BREAKER_RESET", "30")))
+
+    def get(self, base_url: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._items.get(base_url)
+            if breaker is None:
+                breaker = self._items[base_url] = CircuitBreaker(
+                    base_url, self.failures, self.reset_timeout)
+            return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = list(self._items.items())
+        return {url: b.stats() for url, b in items}
+
+
+# ── hedged reads ──────────────────────────────────────────────────────────────
+
+class Hedger:
+    """Send a duplicate GET when the first is slower than the endpoint's
+    ``percentile`` latency; whichever succeeds first wins.
+
+    Thresholds come from the last ``window`` successful GET latencies per
+    path template (fed by a METRICS end hook); no hedging until
+    ``min_samples`` are seen. At most one duplicate per request.
+    """
+
+    def __init__(self, percentile: float = 95.0, min_delay: float = 0.02,
+                 window: int = 200, min_samples: int = 20,
+                 max_workers: int = 32) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.sent = 0
+        self.won = 0
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._fresh: Dict[str, int] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def observe(self, call: Any) -> None:
+        """METRICS end hook: record successful GET latencies."""
+        if call.method != "GET" or call.status is None or not 200 <= call.status < 300:
+            return
+        with self._lock:
+            samples = self._samples.get(call.template)
+            if samples is None:
+                samples = self._samples[call.template] = deque(maxlen=self.window)
+            samples.append(call.elapsed)
+            fresh = self._fresh[call.template] = self._fresh.get(call.template, 0) + 1
+            if len(samples) < self.min_samples:
+                return
+            # Re-sort every 10% of the window rather than on every sample.
+            if call.template in self._thresholds and fresh < max(1, self.window // 10):
+                return
+            ordered = sorted(samples)
+            idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            self._thresholds[call.template] = max(self.min_delay, ordered[idx])
+            self._fresh[call.template] = 0
+
+    def delay(self, template: str) -> Optional[float]:
+        return self._thresholds.get(template)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="oc-hedge")
+            return self._pool
+
+    def run(self, fn: Callable[[], Any], delay: float,
+            discard: Callable[[Any], None]) -> Any:
+        """Run ``fn``; if not done after ``delay``, race a second ``fn``.
+
+        ``discard`` releases the losing result (e.g. closes the response).
+        """
+        pool = self._executor()
+        call = bind(fn)
+        first = pool.submit(call)
+        try:
+            return first.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        second = pool.submit(call)
+        with self._lock:
+            self.sent += 1
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    if fut is second:
+                        with self._lock:
+                            self.won += 1
+                    for other in pending:
+                        other.add_done_callback(
+                            lambda f: f.exception() is None and discard(f.result()))
+                    return fut.result()
+                error = fut.exception()
+        raise error  # type: ignore[misc]
+
+    async def arun(self, fn: Callable[[], Awaitable[Any]], delay: float) -> Any:
+        """asyncio form of run(); the loser is cancelled."""
+        first = asyncio.ensure_future(fn())
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+        second = asyncio.ensure_future(fn())
+        with self._lock:
+            self.sent += 1
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        with self._lock:
+                            self.won += 1
+                    for other in pending:
+                        other.cancel()
+                    return task.result()
+                error = task.exception()
+        raise error  # type: ignore[misc]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"sent": self.sent, "won": self.won,
+                    "thresholds_ms": {t: round(v * 1000, 2)
+                                      for t, v in sorted(self._thresholds.items())}}
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
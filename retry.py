@@ -0,0 +1,87 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# 429 is rejected before the API does any work, so it is safe to retry even
+# for POSTs; the 5xx gateway errors only for GETs or opted-in POSTs.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After."""
+
+    def __init__(self, retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 statuses: frozenset = RETRY_STATUSES) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(retries=int(os.getenv("OPALSTACK_RETRIES", "3")),
+                   backoff=float(os.getenv("OPALSTACK_RETRY_BACKOFF", "0.5")))
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        if retry_after is not None:
+            return min(self.max_backoff, max(0.0, retry_after))
+        cap = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP-date."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Process-wide request rate limiter.
+
+    reserve() always succeeds and returns how long the caller must wait for
+    its slot, so threads can time.sleep() and coroutines asyncio.sleep() on
+    the same bucket.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["TokenBucket"]:
+        """OPALSTACK_RATE_LIMIT=<requests/second>; OPALSTACK_RATE_BURST."""
+        rate = float(os.getenv("OPALSTACK_RATE_LIMIT", "0"))
+        if rate <= 0:
+            return None
+        burst = os.getenv("OPALSTACK_RATE_BURST")
+        return cls(rate, int(burst) if burst else None)
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
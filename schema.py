@@ -0,0 +1,141 @@
+"""Parser for the YAML-style ``\"\"\"---`` tool docstrings.
+
+Covers the subset the tool docstrings use: nested block mappings, ``|``
+block scalars, and flow ``{...}`` / ``[...]`` collections with plain or
+double-quoted scalars. Avoids a PyYAML dependency.
+"""
+
+import inspect
+import json
+from typing import Any, Dict, List, Tuple
+
+
+def parse(doc: str) -> Dict[str, Any]:
+    """Docstring text between ``---`` and ``...`` -> dict."""
+    lines = inspect.cleandoc(doc).splitlines()
+    if lines and lines[0].strip() == "---":
+        lines = lines[1:]
+    if "..." in (l.strip() for l in lines):
+        lines = lines[:[l.strip() for l in lines].index("...")]
+    value, _ = _block(lines, 0, 0)
+    return value
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _block(lines: List[str], i: int, indent: int) -> Tuple[Dict[str, Any], int]:
+    out: Dict[str, Any] = {}
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            i += 1
+            continue
+        ind = _indent(line)
+        if ind < indent:
+            break
+        key, sep, rest = line.strip().partition(":")
+        if not sep:
+            raise ValueError(f"line {i + 1}: expected 'key: value': {line.strip()!r}")
+        rest = rest.strip()
+        i += 1
+        if rest in ("|", "|-"):
+            body = []
+            while i < len(lines) and (not lines[i].strip() or _indent(lines[i]) > ind):
+                body.append(lines[i])
+                i += 1
+            while body and not body[-1].strip():
+                body.pop()
+            text = inspect.cleandoc("\n".join(body)) if body else ""
+            out[key] = text if rest == "|-" else text + "\n"
+        elif rest:
+            out[key] = _flow(rest)
+        else:
+            j = i
+            while j < len(lines) and not lines[j].strip():
+                j += 1
+            if j < len(lines) and _indent(lines[j]) > ind:
+                out[key], i = _block(lines, j, _indent(lines[j]))
+            else:
+                out[key] = None
+    return out, i
+
+
+def _flow(text: str) -> Any:
+    text = text.strip()
+    if text[:1] in "{[":
+        value, pos = _FlowParser(text).value(0)
+        if text[pos:].strip():
+            raise ValueError(f"trailing text after flow value: {text[pos:]!r}")
+        return value
+    return _scalar(text)
+
+
+def _scalar(text: str) -> Any:
+    if text.startswith('"'):
+        return json.loads(text)
+    if text.startswith("'") and text.endswith("'"):
+        return text[1:-1].replace("''", "'")
+    if text in ("null", "~", ""):
+        return None
+    if text in ("true", "false"):
+        return text == "true"
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+class _FlowParser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def _skip(self, pos: int) -> int:
+        while pos < len(self.text) and self.text[pos] in " \t":
+            pos += 1
+        return pos
+
+    def value(self, pos: int) -> Tuple[Any, int]:
+        pos = self._skip(pos)
+        ch = self.text[pos]
+        if ch == "{":
+            return self._mapping(pos + 1)
+        if ch == "[":
+            return self._sequence(pos + 1)
+        if ch == '"':
+            end = pos + 1
+            while self.text[end] != '"':
+                end += 2 if self.text[end] == "\\" else 1
+            return json.loads(self.text[pos:end + 1]), end + 1
+        end = pos
+        while end < len(self.text) and self.text[end] not in ",]}":
+            end += 1
+        return _scalar(self.text[pos:end].strip()), end
+
+    def _mapping(self, pos: int) -> Tuple[Dict[str, Any], int]:
+        out: Dict[str, Any] = {}
+        while True:
+            pos = self._skip(pos)
+            if self.text[pos] == "}":
+                return out, pos + 1
+            colon = self.text.index(":", pos)
+            key = self.text[pos:colon].strip().strip('"')
+            out[key], pos = self.value(colon + 1)
+            pos = self._skip(pos)
+            if self.text[pos] == ",":
+                pos += 1
+
+    def _sequence(self, pos: int) -> Tuple[List[Any], int]:
+        out: List[Any] = []
+        while True:
+            pos = self._skip(pos)
+            if self.text[pos] == "]":
+                return out, pos + 1
+            item, pos = self.value(pos)
+            out.append(item)
+            pos = self._skip(pos)
+            if self.text[pos] == ",":
+                pos += 1
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight block and receive the same return value (or exception). Nothing
+    is remembered once the call finishes — that is the cache's job.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "saved": self.shared,
+                    "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Event-loop form of SingleFlight; followers await the leader's task."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is not None:
+            self.shared += 1
+            return await asyncio.shield(task)
+        self.executed += 1
+        task = self._tasks[key] = asyncio.ensure_future(fn())
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._tasks.pop(key, None)
+            else:
+                task.add_done_callback(lambda _: self._tasks.pop(key, None))
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "saved": self.shared,
+                "in_flight": len(self._tasks)}
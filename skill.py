@@ -1,19 +1,62 @@
+import functools
+import inspect
 import os
-from .transport import Transport
+from typing import Any, Callable, Optional
+
+from . import validate
+from .transport import (
+    AsyncTransport, Transport, get_async_transport, get_transport,
+)
+
+
+def validated(method: Callable) -> Callable:
+    """Check ``payload`` against the action's docstring schema before calling.
+
+    The schema is compiled once per docstring and read from the wrapper's
+    ``__doc__`` at call time, so async tools that copy the sync docstring
+    after class creation are covered too. Raises validate.ValidationError.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, action: str, payload: Any = None):
+            validate.check(async_wrapper.__doc__ or "", action, payload)
+            return await method(self, action, payload)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, action: str, payload: Any = None):
+        validate.check(wrapper.__doc__ or "", action, payload)
+        return method(self, action, payload)
+    return wrapper
 
 
 class SkillBase:
     """Base for all Opalstack skill tools.
 
-    Reads OPALSTACK_API_TOKEN from the environment once per tool call.
-    Subclasses call self._transport() to get an authenticated Transport.
+    Reads OPALSTACK_API_TOKEN from the environment once per tool call,
+    unless the tool was built with an explicit ``token`` (multi-account use).
+    Subclasses call self._transport() to get the pooled, authenticated
+    Transport shared by every tool using the same token and base URL.
     """
 
+    def __init__(self, token: Optional[str] = None) -> None:
+        self.token = token
+
     def _token(self) -> str:
-        token = os.getenv("OPALSTACK_API_TOKEN", "")
+        token = getattr(self, "token", None) or os.getenv("OPALSTACK_API_TOKEN", "")
         if not token:
             raise RuntimeError("OPALSTACK_API_TOKEN env var not set")
         return token
 
     def _transport(self) -> Transport:
-        return Transport(token=self._token())
+        return get_transport(self._token())
+
+
+class AsyncSkillBase(SkillBase):
+    """Base for the asyncio tool variants.
+
+    self._transport() returns the AsyncTransport pooled on the running loop.
+    """
+
+    def _transport(self) -> AsyncTransport:
+        return get_async_transport(self._token())
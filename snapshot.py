@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Resources whose list endpoint is mirrored: "/<resource>/list/".
+RESOURCES = ("app", "domain", "osuser", "mariadb", "psqldb")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    account  TEXT NOT NULL,
+    base_url TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    id       TEXT NOT NULL,
+    hash     TEXT NOT NULL,
+    body     TEXT NOT NULL,
+    PRIMARY KEY (account, base_url, resource, id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    account   TEXT NOT NULL,
+    base_url  TEXT NOT NULL,
+    resource  TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    stale     REAL    NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, base_url, resource)
+);
+"""
+
+
+def account_of(token: str) -> str:
+    """Stable account key; the token itself is never written to disk."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def digest(obj: Any) -> str:
+    """Order-independent content hash of one API object."""
+    raw = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def list_resource(path: str, params: Optional[dict]) -> Optional[str]:
+    """'/app/list/' -> 'app' for the mirrored list endpoints, else None."""
+    parts = path.strip("/").split("/")
+    if params or len(parts) != 2 or parts[1] != "list" or parts[0] not in RESOURCES:
+        return None
+    return parts[0]
+
+
+class SnapshotStore:
+    """SQLite mirror of the five list endpoints, per account and base URL.
+
+    A resource is served from disk while it was synced less than ``max_age``
+    seconds ago and has not been marked stale by a mutation. sync() diffs a
+    live list against stored row hashes and only rewrites changed rows.
+    ``stale`` holds the time of the last mark and ``synced_at`` the time the
+    stored list was requested, so a list fetched before a mutation, or
+    before the stored one, cannot replace it (see sync's ``since``).
+    """
+
+    def __init__(self, path: str, max_age: float = 300.0) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["SnapshotStore"]:
+        """OPALSTACK_SNAPSHOT=<sqlite path>; OPALSTACK_SNAPSHOT_MAX_AGE seconds."""
+        path = os.getenv("OPALSTACK_SNAPSHOT")
+        if not path:
+            return None
+        return cls(os.path.expanduser(path),
+                   float(os.getenv("OPALSTACK_SNAPSHOT_MAX_AGE", "300")))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def read(self, account: str, base_url: str, resource: str,
+             max_age: Optional[float] = None) -> Optional[list]:
+        """Stored list if fresh enough, else None. max_age=inf ignores staleness."""
+        limit = self.max_age if max_age is None else max_age
+        with self._lock:
+            meta = self._db.execute(
+                "SELECT synced_at, stale FROM meta"
+                " WHERE account=? AND base_url=? AND resource=?",
+                (account, base_url, resource)).fetchone()
+            if meta is None:
+                return None
+            synced_at, stale = meta
+            if limit != float("inf") and (stale or time.time() - synced_at > limit):
+                return None
+            rows = self._db.execute(
+                "SELECT body FROM rows WHERE account=? AND base_url=? AND resource=?",
+                (account, base_url, resource)).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def sync(self, account: str, base_url: str, resource: str,
+             objects: list, since: Optional[float] = None) -> Dict[str, int]:
+        """Make the stored rows match ``objects``; returns change counts.
+
+        ``since`` is the time.time() at which the list request was sent. If
+        the resource was marked stale at or after it, or the stored list was
+        requested later, this list may be outdated and nothing is written
+        (counts has ``"skipped": 1``).
+        """
+        live = {str(o["id"]): (digest(o), o) for o in objects if isinstance(o, dict)}
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        with self._lock:
+            if since is not None:
+                meta = self._db.execute(
+                    "SELECT synced_at, stale FROM meta"
+                    " WHERE account=? AND base_url=? AND resource=?",
+                    (account, base_url, resource)).fetchone()
+                if meta is not None and (meta[0] > since or meta[1] >= since):
+                    counts["skipped"] = 1
+                    return counts
+            stored = dict(self._db.execute(
+                "SELECT id, hash FROM rows WHERE account=? AND base_url=? AND resource=?",
+                (account, base_url, resource)).fetchall())
+            upserts = []
+            for oid, (h, obj) in live.items():
+                old = stored.get(oid)
+                if old == h:
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated" if old else "inserted"] += 1
+                upserts.append((account, base_url, resource, oid, h,
+                                json.dumps(obj, separators=(",", ":"))))
+            gone = [(account, base_url, resource, oid)
+                    for oid in stored.keys() - live.keys()]
+            counts["deleted"] = len(gone)
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?, ?)", upserts)
+                self._db.executemany(
+                    "DELETE FROM rows WHERE account=? AND base_url=? AND resource=? AND id=?",
+                    gone)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?, 0)",
+                    (account, base_url, resource, time.time() if since is None else since))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return counts
+
+    def mark_stale(self, account: str, base_url: str, resource: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE meta SET stale=? WHERE account=? AND base_url=? AND resource=?",
+                (time.time(), account, base_url, resource))
+
+    def status(self, account: str, base_url: str) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            meta = self._db.execute(
+                "SELECT resource, synced_at, stale FROM meta"
+                " WHERE account=? AND base_url=?", (account, base_url)).fetchall()
+            counts = dict(self._db.execute(
+                "SELECT resource, COUNT(*) FROM rows"
+                " WHERE account=? AND base_url=? GROUP BY resource",
+                (account, base_url)).fetchall())
+        return {
+            res: {"rows": counts.get(res, 0), "age": round(now - synced_at, 1),
+                  "fresh": not stale and now - synced_at <= self.max_age}
+            for res, synced_at, stale in meta
+        }
@@ -0,0 +1,270 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Literal, Any, Dict, List
+import logging
+import time
+
+from .app import ApplicationAPI
+from .batch import _error, _failures
+from .domain import DomainAPI
+from .installers import CATALOGUE, DEFAULT_OS
+from .mariadb import MariaDBAPI
+from .osuser import OSUserAPI
+from .poll import TIMEOUT
+from .psqldb import PSQLDBAPI
+from .resilience import bind
+from .skill import SkillBase, validated
+
+logger = logging.getLogger("oc_skill.stack")
+
+# spec key -> API class; values here are also the valid node kinds
+KINDS = {
+    "osusers":  OSUserAPI,
+    "apps":     ApplicationAPI,
+    "domains":  DomainAPI,
+    "mariadbs": MariaDBAPI,
+    "psqldbs":  PSQLDBAPI,
+}
+MAX_WORKERS = 8
+
+
+class _Node:
+    __slots__ = ("ref", "kind", "body", "deps")
+
+    def __init__(self, ref: str, kind: str, body: Dict[str, Any]) -> None:
+        self.ref = ref
+        self.kind = kind
+        self.body = body
+        self.deps = set(_refs(body))
+
+
+def _ref(value: Any) -> Any:
+    """The name in a {"$ref": "<name>"} placeholder, else None.
+
+    Only this explicit form is a reference, so strings that merely start
+    with "$" (passwords, "$HOME" in json settings) pass through untouched.
+    """
+    if isinstance(value, dict) and len(value) == 1 and isinstance(value.get("$ref"), str):
+        return value["$ref"]
+    return None
+
+
+def _refs(value: Any):
+    """Yield every {"$ref": ...} name inside a payload."""
+    name = _ref(value)
+    if name is not None:
+        yield name
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _refs(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _refs(v)
+
+
+def _substitute(value: Any, ids: Dict[str, str]) -> Any:
+    name = _ref(value)
+    if name is not None:
+        return ids[name]
+    if isinstance(value, dict):
+        return {k: _substitute(v, ids) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, ids) for v in value]
+    return value
+
+
+def _apply_installer(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand {"installer": "wordpress", "os": "el9"} into type/installer_url/json."""
+    body = dict(body)
+    name = body.pop("installer", None)
+    os_tag = body.pop("os", DEFAULT_OS)
+    if name is None:
+        return body
+    entry = CATALOGUE.get(name)
+    body.setdefault("type", entry["app_type"])
+    if entry["url"]:
+        if os_tag not in entry["url"]:
+            raise ValueError(f"installer {name!r} has no {os_tag} build")
+        body.setdefault("installer_url", entry["url"][os_tag])
+    body["json"] = {**entry["json"], **body.get("json", {})}
+    return body
+
+
+def build(spec: Dict[str, Any]) -> Dict[str, _Node]:
+    """Parse a stack spec into nodes; raises ValueError on bad refs or cycles."""
+    nodes: Dict[str, _Node] = {}
+    for kind in KINDS:
+        for i, item in enumerate(spec.get(kind) or []):
+            item = dict(item)
+            ref = item.pop("ref", None) or f"{kind}[{i}]"
+            if ref in nodes:
+                raise ValueError(f"duplicate ref {ref!r}")
+            if kind == "apps":
+                item = _apply_installer(item)
+            nodes[ref] = _Node(ref, kind, item)
+    for node in nodes.values():
+        missing = node.deps - nodes.keys()
+        if missing:
+            raise ValueError(f"{node.ref}: unknown ref(s) {sorted(missing)}")
+    levels(nodes)
+    return nodes
+
+
+def levels(nodes: Dict[str, _Node]) -> List[List[str]]:
+    """Group refs into waves; every ref only depends on earlier waves."""
+    done: set = set()
+    out: List[List[str]] = []
+    while len(done) < len(nodes):
+        wave = sorted(r for r, n in nodes.items() if r not in done and n.deps <= done)
+        if not wave:
+            cycle = sorted(nodes.keys() - done)
+            raise ValueError(f"dependency cycle among {cycle}")
+        out.append(wave)
+        done.update(wave)
+    return out
+
+
+class StackAPI:
+    def __init__(self, token: str) -> None:
+        self.apis = {kind: cls(token=token) for kind, cls in KINDS.items()}
+
+    def plan(self, spec: Dict[str, Any]) -> dict:
+        nodes = build(spec)
+        return {
+            "waves": levels(nodes),
+            "nodes": {r: {"kind": n.kind, "deps": sorted(n.deps)}
+                      for r, n in nodes.items()},
+        }
+
+    def apply(self, spec: Dict[str, Any]) -> dict:
+        """Create every node as soon as its dependencies are ready.
+
+        A node with dependents is polled on its list endpoint after the
+        create POST until it reports ready; only then are the dependents
+        created. Independent branches run concurrently. A failed node (or
+        one not ready within ``ready_timeout``) marks its dependents
+        "skipped"; unrelated branches still complete.
+        """
+        nodes = build(spec)
+        workers = max(1, int(spec.get("max_workers") or MAX_WORKERS))
+        ready_timeout = (TIMEOUT if spec.get("ready_timeout") is None
+                         else float(spec["ready_timeout"]))
+        parents = {dep for node in nodes.values() for dep in node.deps}
+        ids: Dict[str, str] = {}
+        report: Dict[str, Dict[str, Any]] = {}
+        t0 = time.monotonic()
+
+        def create(node: _Node) -> str:
+            started = time.monotonic()
+            report[node.ref] = {"kind": node.kind, "status": "running",
+                                "started": round(started - t0, 3)}
+            api = self.apis[node.kind]
+            resp = api.create(_substitute(node.body, ids))
+            obj = resp[0] if isinstance(resp, list) else resp
+            oid = obj["id"]
+            if node.ref in parents:
+                report[node.ref]["id"] = oid
+                polled = api.wait_ready({"ids": [oid], "timeout": ready_timeout})
+                if not polled["done"]:
+                    raise RuntimeError(f"{node.kind} {oid} not ready after "
+                                       f"{polled['elapsed']}s ({polled['polls']} polls)")
+            report[node.ref]["elapsed"] = round(time.monotonic() - started, 3)
+            return oid
+
+        pending = dict(nodes)
+        running: Dict[Future, _Node] = {}
+        failed: set = set()
+        # API errors, network errors (POSTs are not retried) and malformed responses
+        node_errors = _failures(self.apis["osusers"].http) + (KeyError, TypeError, IndexError)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                changed = True
+                while changed:
+                    changed = False
+                    for ref, node in list(pending.items()):
+                        if node.deps & failed:
+                            del pending[ref]
+                            failed.add(ref)
+                            changed = True
+                            report[ref] = {"kind": node.kind, "status": "skipped",
+                                           "error": f"dependency failed: {sorted(node.deps & failed)}"}
+                        elif node.deps <= ids.keys():
+                            del pending[ref]
+                            running[pool.submit(bind(create), node)] = node
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    node = running.pop(fut)
+                    try:
+                        ids[node.ref] = fut.result()
+                        report[node.ref].update(status="ok", id=ids[node.ref])
+                    except node_errors as exc:
+                        logger.warning("stack node %s failed: %s", node.ref, exc)
+                        failed.add(node.ref)
+                        report[node.ref].update(status="failed", error=_error(exc))
+        return {
+            "ok": not failed,
+            "elapsed": round(time.monotonic() - t0, 3),
+            "ids": ids,
+            "nodes": report,
+        }
+
+
+class StackTools(SkillBase):
+    @validated
+    def stack(
+        self,
+        action: Literal["plan", "apply"],
+        payload: Any | None = None,
+    ):
+        """---
+        name: stack
+        description: |
+            Provisions a whole stack (OS users, apps, domains, MariaDB and
+            PostgreSQL databases) from one declarative spec.
+            Any value {"$ref": "<ref>"} is replaced with the id of the node
+            whose "ref" matches, and makes this node depend on it.
+            Dependents are created once that node reports ready.
+            Independent branches are created concurrently, e.g. domains and
+            databases while the OS user is still being created.
+            Apps may set "installer" (a selected_type from installer_urls)
+            and "os" (el7/el9, default el9) instead of type/installer_url.
+
+        parameters:
+            type: object
+            properties:
+                action:
+                    type: string
+                    enum: [plan, apply]
+                payload:
+                    type: object
+            required: [action, payload]
+
+        actions:
+            plan:
+                summary: Validate the spec and return the dependency waves without creating anything.
+                payload:
+                    properties:
+                        osusers:  { type: array, items: { type: object } }
+                        apps:     { type: array, items: { type: object } }
+                        domains:  { type: array, items: { type: object } }
+                        mariadbs: { type: array, items: { type: object } }
+                        psqldbs:  { type: array, items: { type: object } }
+            apply:
+                summary: Create every node in dependency order, waiting for each parent to be ready; returns ids and per-node timing.
+                payload:
+                    properties:
+                        osusers:       { type: array, items: { type: object } }
+                        apps:          { type: array, items: { type: object } }
+                        domains:       { type: array, items: { type: object } }
+                        mariadbs:      { type: array, items: { type: object } }
+                        psqldbs:       { type: array, items: { type: object } }
+                        max_workers:   { type: integer, default: 8 }
+                        ready_timeout: { type: number, default: 300, description: "Seconds to wait for a node with dependents to report ready." }
+        ...
+        """
+        api = StackAPI(token=self._token())
+        return {
+            "plan":  api.plan,
+            "apply": api.apply,
+        }[action](payload or {})
@@ -0,0 +1,87 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+CHUNK_SIZE = 64 * 1024
+_WS = " \t\r\n"
+
+
+class ArrayParser:
+    """Incremental parser for a top-level JSON array.
+
+    feed() takes raw bytes as they arrive and returns the elements completed
+    so far, so only one element (plus the unparsed tail) is held at a time.
+    With ``fields`` each element is cut down to those keys as soon as it is
+    decoded, so callers never keep the full objects around.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None) -> None:
+        self.fields = tuple(fields) if fields else None
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        self._buf += self._utf8.decode(chunk, final)
+        out: List[Any] = []
+        buf = self._buf
+        pos = self._pos
+        while not self._done:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos == len(buf):
+                break
+            if not self._started:
+                if buf[pos] != "[":
+                    raise ValueError("response is not a JSON array")
+                self._started = True
+                pos += 1
+                continue
+            if buf[pos] == ",":
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                self._done = True
+                pos += 1
+                break
+            try:
+                value, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            # A number may still be growing ("1" -> "1.5", "1." -> "1.5",
+            # "1e" -> "1e3"): take it only once its delimiter has arrived.
+            if not final and isinstance(value, (int, float)):
+                nxt = end
+                while nxt < len(buf) and buf[nxt] in _WS:
+                    nxt += 1
+                if nxt == len(buf) or buf[nxt] not in ",]":
+                    break
+            pos = end
+            if self.fields is not None and isinstance(value, dict):
+                value = {k: value[k] for k in self.fields if k in value}
+            out.append(value)
+        # Drop the consumed prefix once it is worth the copy.
+        if pos > CHUNK_SIZE or pos == len(buf):
+            self._buf, self._pos = buf[pos:], 0
+        else:
+            self._pos = pos
+        return out
+
+    def close(self) -> List[Any]:
+        out = self.feed(b"", final=True)
+        if not self._done:
+            raise ValueError("truncated JSON array")
+        return out
+
+
+def iter_array(chunks: Iterable[bytes],
+               fields: Optional[Sequence[str]] = None) -> Iterator[Any]:
+    parser = ArrayParser(fields)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -0,0 +1,219 @@
+"""Local stub of the Opalstack ``/api/v1`` endpoints for benchmarks.
+
+Serves list/read/create/update/delete for the five resources from memory,
+with configurable latency, injected 5xx errors, 429 responses and padded
+objects. GET ``/_stats`` returns connection and request counters; POST
+``/_reset`` zeroes them.
+
+    python -m oc_skill.stub --port 8000 --latency 20 --rate-429 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+
+RESOURCES = ("app", "domain", "osuser", "mariadb", "psqldb")
+PREFIX = "/api/v1"
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.0      # seconds added to every response
+    jitter: float = 0.0       # extra uniform random delay, seconds
+    error_rate: float = 0.0   # fraction of requests answered 503
+    rate_429: float = 0.0     # fraction of requests answered 429
+    retry_after: float = 0.0  # Retry-After seconds sent with 429
+    list_size: int = 100      # objects seeded per resource
+    pad: int = 0              # bytes of filler per object
+    servers: int = 4
+    seed: int = 0
+
+
+class StubState:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.servers = [str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+                        for _ in range(max(1, config.servers))]
+        self.db: Dict[str, Dict[str, dict]] = {r: {} for r in RESOURCES}
+        self.reset()
+        for res in ("osuser", "mariadb", "psqldb", "domain", "app"):
+            for i in range(config.list_size):
+                self.create(res, {"name": f"{res}{i}"})
+
+    def reset(self) -> None:
+        with self.lock:
+            self.stats: Dict[str, Any] = {"connections": 0, "requests": 0,
+                                          "bytes_out": 0, "status": {}}
+
+    def count(self, key: str, n: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += n
+
+    def status(self, code: int, size: int) -> None:
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_out"] += size
+            self.stats["status"][str(code)] = self.stats["status"].get(str(code), 0) + 1
+
+    def create(self, res: str, obj: dict) -> dict:
+        with self.lock:
+            oid = str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+            server = self.rng.choice(self.servers)
+            osusers = list(self.db["osuser"])
+            osuser = self.rng.choice(osusers) if osusers else None
+        new = {"id": oid, "ready": True, **obj}
+        if res in ("osuser", "mariadb", "psqldb"):
+            new.setdefault("server", server)
+        if res == "app":
+            new.setdefault("osuser", osuser)
+        if self.config.pad:
+            new["notes"] = "x" * self.config.pad
+        with self.lock:
+            self.db[res][oid] = new
+        return new
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    state: StubState
+
+    def setup(self) -> None:
+        super().setup()
+        self.state.count("connections")
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _reply(self, code: int, body: Any, headers: Tuple = ()) -> None:
+        raw = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(raw)
+        except (BrokenPipeError, ConnectionResetError):
+            return  # client gave up (deadline, hedge loser); not a stub error
+        if not self.path.startswith("/_"):
+            self.state.status(code, len(raw))
+
+    def _route(self) -> Tuple[str, str, str]:
+        parts = self.path.split("?")[0][len(PREFIX):].strip("/").split("/")
+        return (parts + ["", "", ""])[:3]
+
+    def _inject(self) -> bool:
+        cfg = self.state.config
+        delay = cfg.latency + (random.uniform(0, cfg.jitter) if cfg.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        roll = random.random()
+        if roll < cfg.rate_429:
+            headers = (("Retry-After", str(cfg.retry_after)),) if cfg.retry_after else ()
+            self._reply(429, {"detail": "rate limited"}, headers)
+            return True
+        if roll < cfg.rate_429 + cfg.error_rate:
+            self._reply(503, {"detail": "injected error"})
+            return True
+        return False
+
+    def do_GET(self) -> None:
+        if self.path == "/_stats":
+            with self.state.lock:
+                return self._reply(200, {**self.state.stats,
+                                         "config": asdict(self.state.config)})
+        if self._inject():
+            return
+        res, verb, oid = self._route()
+        table = self.state.db.get(res)
+        if table is None:
+            return self._reply(404, {"detail": "not found"})
+        with self.state.lock:
+            if verb == "list":
+                body: Any = [dict(o) for o in table.values()]
+            else:
+                body = dict(table[oid]) if verb == "read" and oid in table else None
+        if body is None:
+            return self._reply(404, {"detail": "not found"})
+        self._reply(200, body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"[]")
+        if self.path == "/_reset":
+            self.state.reset()
+            return self._reply(200, {})
+        if self._inject():
+            return
+        res, verb, _ = self._route()
+        table = self.state.db.get(res)
+        if table is None or not isinstance(body, list):
+            return self._reply(400, {"detail": "bad request"})
+        if verb == "create":
+            return self._reply(200, [self.state.create(res, obj) for obj in body])
+        out = []
+        with self.state.lock:
+            for obj in body:
+                if verb == "update" and obj.get("id") in table:
+                    table[obj["id"]].update(obj)
+                    out.append(dict(table[obj["id"]]))
+                elif verb == "delete" and obj.get("id") in table:
+                    out.append(table.pop(obj["id"]))
+                else:
+                    out = None
+                    break
+        if out is None:
+            return self._reply(404, {"detail": "not found"})
+        self._reply(200, out)
+
+
+def serve(config: StubConfig, host: str = "127.0.0.1",
+          port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub on a daemon thread; returns (server, base URL)."""
+    handler = type("Handler", (StubHandler,), {"state": StubState(config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}{PREFIX}"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=0.0, help="ms per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered 503")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction answered 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After seconds")
+    parser.add_argument("--list-size", type=int, default=100, help="objects per resource")
+    parser.add_argument("--pad", type=int, default=0, help="filler bytes per object")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                      error_rate=args.error_rate, rate_429=args.rate_429,
+                      retry_after=args.retry_after, list_size=args.list_size,
+                      pad=args.pad, seed=args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server, url = serve(config_from(args), args.host, args.port)
+    print(url, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
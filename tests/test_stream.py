@@ -0,0 +1,20 @@
+import pytest
+
+from oc_skill.stream import iter_array
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([b"[1.", b"5]"], [1.5]),
+    ([b"[1e", b"3]"], [1000.0]),
+    ([b"[1", b"2, -", b"3]"], [12, -3]),
+    ([b"[1.5e-", b"2 ", b", 7]"], [0.015, 7]),
+    ([b'[{"id": 1}', b', true, null]'], [{"id": 1}, True, None]),
+])
+def test_numbers_split_across_chunks(chunks, expected):
+    assert list(iter_array(chunks)) == expected
+
+
+def test_every_split_point():
+    raw = b'[1.25, -3e2, {"n": 4.5}, "x", 10]'
+    for i in range(len(raw) + 1):
+        assert list(iter_array([raw[:i], raw[i:]])) == [1.25, -300.0, {"n": 4.5}, "x", 10]
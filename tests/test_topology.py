@@ -0,0 +1,23 @@
+from oc_skill.inventory import Inventory
+from oc_skill.topology import build
+
+
+def _ids(nodes):
+    return [n["id"] for n in nodes]
+
+
+def test_app_with_missing_osuser_is_unplaced():
+    inv = Inventory({
+        "osuser": [{"id": "u1", "name": "web", "server": "s1"}],
+        "app":    [{"id": "a1", "name": "orphan", "osuser": "gone"},
+                   {"id": "a2", "name": "site", "osuser": "u1"}],
+    })
+    out = build(inv)
+
+    assert out["counts"]["app"] == 2
+    [server] = out["servers"]
+    [osuser] = server["osusers"]
+    assert _ids(osuser["apps"]) == ["a2"]
+    assert _ids(out["unplaced"]) == ["a1"]
+    assert "a1" not in inv.parent
+    assert inv.by_osuser == {"u1": ["a2"]}
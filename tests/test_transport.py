@@ -0,0 +1,79 @@
+import json
+import threading
+
+import pytest
+import requests
+
+from oc_skill import transport
+from oc_skill.cache import ResponseCache
+from oc_skill.snapshot import SnapshotStore
+
+
+def _response(status: int, body: object, url: str) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status
+    r.url = url
+    r._content = json.dumps(body).encode()
+    r._content_consumed = True
+    return r
+
+
+class SlowFirstList:
+    """Fake session: the first list GET answers with the version current when
+    it was sent, but only once ``release`` is set; POSTs bump the version."""
+
+    def __init__(self) -> None:
+        self.headers: dict = {}
+        self.version = 1
+        self.sent = threading.Event()
+        self.release = threading.Event()
+        self.lists = 0
+
+    def request(self, method, url, **kwargs):
+        if method == "POST":
+            self.version += 1
+            return _response(200, [{"id": "a1", "v": self.version}], url)
+        seen = self.version
+        self.lists += 1
+        if self.lists == 1:
+            self.sent.set()
+            self.release.wait(5)
+        return _response(200, [{"id": "a1", "v": seen}], url)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def http(monkeypatch, tmp_path):
+    store = SnapshotStore(str(tmp_path / "snap.db"))
+    monkeypatch.setattr(transport, "CACHE", ResponseCache())
+    monkeypatch.setattr(transport, "SNAPSHOT", store)
+    monkeypatch.setattr(transport, "BREAKERS", None)
+    t = transport.Transport("tok", base_url="http://api.test")
+    t.session.close()
+    t.session = SlowFirstList()
+    yield t
+    store.close()
+
+
+def test_get_after_post_never_sees_pre_post_data(http):
+    early: dict = {}
+    leader = threading.Thread(target=lambda: early.update(rows=http.get("/app/list/")))
+    leader.start()
+    assert http.session.sent.wait(5)
+
+    http.post("/app/update/", {"id": "a1"})
+    late: dict = {}
+    follower = threading.Thread(target=lambda: late.update(rows=http.get("/app/list/")))
+    follower.start()
+    follower.join(1)  # a follower that joined the pre-POST flight is still blocked
+    http.session.release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert early["rows"] == [{"id": "a1", "v": 1}]
+    assert late["rows"] == [{"id": "a1", "v": 2}]
+    assert http.get("/app/list/") == [{"id": "a1", "v": 2}]
+    snap = transport.SNAPSHOT.read(http.account, http.base_url, "app")
+    assert snap in (None, [{"id": "a1", "v": 2}])
@@ -0,0 +1,111 @@
+from typing import Literal, Any, Dict, List, Sequence
+import logging
+
+from .inventory import Inventory, fetch_all
+from .transport import get_transport
+from .skill import SkillBase, validated
+
+logger = logging.getLogger("oc_skill.topology")
+
+# keys kept per object unless the caller asks for more with "fields"
+FIELDS = {
+    "osuser":  ("id", "name"),
+    "app":     ("id", "name", "type"),
+    "domain":  ("id", "name"),
+    "mariadb": ("id", "name"),
+    "psqldb":  ("id", "name"),
+}
+
+
+def _compact(obj: dict, extra: Sequence[str]) -> dict:
+    keys = FIELDS[obj["kind"]] + tuple(extra)
+    return {k: obj[k] for k in keys if k in obj}
+
+
+def _by_name(objs: List[dict]) -> List[dict]:
+    return sorted(objs, key=lambda o: (str(o.get("name")), o["id"]))
+
+
+def build(inv: Inventory, server: str = "", extra: Sequence[str] = ()) -> Dict[str, Any]:
+    """server -> osusers -> apps, with databases per server.
+
+    Domains have no server or app link in the API, so they are listed at
+    account level. Objects whose parent is missing from the lists (e.g. an
+    app whose osuser was just deleted) go under "unplaced".
+    """
+    servers: List[dict] = []
+    for sid in sorted(s for s in inv.by_server if not server or s == server):
+        node: Dict[str, Any] = {"id": sid, "osusers": [], "mariadbs": [], "psqldbs": []}
+        for cid in inv.children.get(sid, ()):
+            child = inv.by_id[cid]
+            if child["kind"] == "osuser":
+                apps = [inv.by_id[a] for a in inv.children.get(cid, ())]
+                node["osusers"].append({**_compact(child, extra),
+                                        "apps": [_compact(a, extra) for a in _by_name(apps)]})
+            else:
+                node[child["kind"] + "s"].append(_compact(child, extra))
+        node["osusers"] = _by_name(node["osusers"])
+        node["mariadbs"] = _by_name(node["mariadbs"])
+        node["psqldbs"] = _by_name(node["psqldbs"])
+        servers.append(node)
+    out: Dict[str, Any] = {"servers": servers}
+    if not server:
+        out["domains"] = [_compact(d, extra) for d in
+                          _by_name([o for o in inv.by_id.values() if o["kind"] == "domain"])]
+        out["unplaced"] = [_compact(o, extra) for o in _by_name(
+            [o for oid, o in inv.by_id.items()
+             if o["kind"] != "domain" and oid not in inv.parent])]
+    out["counts"] = inv.counts()
+    return out
+
+
+class TopologyAPI:
+    def __init__(self, token: str) -> None:
+        self.http = get_transport(token)
+
+    def get(self, data: Dict[str, Any]) -> dict:
+        inv = Inventory(fetch_all(self.http, fresh=bool(data.get("fresh"))))
+        return build(inv, data.get("server") or "", data.get("fields") or ())
+
+
+class TopologyTools(SkillBase):
+    @validated
+    def topology(
+        self,
+        action: Literal["get"],
+        payload: Any | None = None,
+    ):
+        """---
+        name: topology
+        description: |
+            One-call map of what runs where: servers -> OS users -> apps,
+            with the MariaDB and PostgreSQL databases on each server.
+            The five resource lists are fetched concurrently over one pooled
+            connection and joined locally. Domains have no server link in
+            the API and are listed at account level.
+            Use instead of five "list" calls joined by hand.
+
+        parameters:
+            type: object
+            properties:
+                action:
+                    type: string
+                    enum: [get]
+                payload:
+                    type: [object, "null"]
+            required: [action]
+
+        actions:
+            get:
+                summary: Compact tree of servers, OS users, apps and databases plus account domains.
+                payload:
+                    properties:
+                        server: { type: string, format: uuid, description: "Only this server's subtree." }
+                        fields: { type: array, items: { type: string }, description: "Extra keys to keep per object." }
+                        fresh:  { type: boolean, default: false, description: "Bypass cache and snapshot." }
+        ...
+        """
+        api = TopologyAPI(token=self._token())
+        return {
+            "get": api.get,
+        }[action](payload or {})
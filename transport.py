@@ -1,9 +1,30 @@
 import os
 import json
+import time
+import atexit
+import asyncio
+import itertools
 import logging
-from typing import Any, Optional
-import requests
-from requests import Response, Session
+import threading
+import weakref
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator, Optional, Sequence, Tuple, Union,
+)
+
+if TYPE_CHECKING:  # requests is imported on first Transport() to keep registration cheap
+    from requests import Response, Session
+
+from .cache import ResponseCache, cacheable, resource_of
+from .metrics import Call, Metrics, template
+from .recording import Recorder
+from .resilience import (
+    Breakers, CircuitBreaker, CircuitOpenError, DeadlineExceeded, Hedger, deadline, remaining,
+)
+from .retry import RetryPolicy, TokenBucket, parse_retry_after
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .stream import CHUNK_SIZE, ArrayParser, iter_array
+from .snapshot import SnapshotStore, account_of, list_resource
 
 LOG = logging.getLogger("oc_skill.transport")
 
@@ -21,39 +42,668 @@ def resolve_base_url() -> str:
 
 BASE_URL: str = resolve_base_url()
 
+POOL_SIZE: int = int(os.getenv("OPALSTACK_POOL_SIZE", "10"))
+POOL_IDLE: float = float(os.getenv("OPALSTACK_POOL_IDLE", "300"))
+POOL_MAX: int = int(os.getenv("OPALSTACK_POOL_MAX", "32"))
+ASYNC_CONCURRENCY: int = int(os.getenv("OPALSTACK_ASYNC_CONCURRENCY", "100"))
+CONNECT_TIMEOUT: float = float(os.getenv("OPALSTACK_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT: float = float(os.getenv("OPALSTACK_READ_TIMEOUT", "10"))
+
+# Opt-in read-through cache shared by every transport (OPALSTACK_CACHE=1).
+CACHE: Optional[ResponseCache] = ResponseCache.from_env()
+
+
+def enable_cache(**kwargs: Any) -> ResponseCache:
+    """Turn on the shared list/read cache; kwargs go to ResponseCache."""
+    global CACHE
+    CACHE = ResponseCache(**kwargs)
+    return CACHE
+
+
+def disable_cache() -> None:
+    global CACHE
+    CACHE = None
+
+
+# Retry policy and client-side rate limit shared by every transport.
+RETRY: RetryPolicy = RetryPolicy.from_env()
+LIMITER: Optional[TokenBucket] = TokenBucket.from_env()
+
+
+def set_rate_limit(rate: float, burst: Optional[int] = None) -> None:
+    """Cap all transports in the process at ``rate`` requests/second (0 = off)."""
+    global LIMITER
+    LIMITER = TokenBucket(rate, burst) if rate > 0 else None
+
+
+# Opt-in write-behind for single updates (OPALSTACK_WRITE_BEHIND_MS): updates
+# to the same resource type within the window are merged per id and sent
+# as one list POST. See coalesce.py.
+WRITE_BEHIND: float = float(os.getenv("OPALSTACK_WRITE_BEHIND_MS", "0")) / 1000
+
+
+def enable_write_behind(window_ms: float = 50.0) -> None:
+    global WRITE_BEHIND
+    WRITE_BEHIND = max(0.0, window_ms) / 1000
+
+
+def disable_write_behind() -> None:
+    global WRITE_BEHIND
+    WRITE_BEHIND = 0.0
+
+
+# Concurrent identical GETs (same token, base URL, path, params) share one
+# request. FLIGHTS.stats()["saved"] counts the requests that were not sent.
+FLIGHTS = SingleFlight()
+
+# Write stamp per (transport key, resource), bumped by every POST before the
+# cache and snapshot are invalidated. It is part of the flight key, so a GET
+# issued after a write never joins a flight that was sent before it.
+_WRITE_SEQ = itertools.count(1)
+_WRITES: dict[tuple, int] = {}
+
+
+# Per-endpoint counts, latency histograms, bytes and retries for every
+# request sent, plus start/end hooks for tracing (METRICS.add_hook).
+METRICS = Metrics()
+
+
+# Per-base-URL circuit breakers (OPALSTACK_BREAKER_FAILURES, 0 = off): after
+# repeated 5xx/timeouts requests fail fast with CircuitOpenError until a
+# half-open probe succeeds.
+BREAKERS: Optional[Breakers] = Breakers.from_env()
+
+# Opt-in hedged GETs (OPALSTACK_HEDGE_PERCENTILE): a duplicate read is sent
+# when the first is slower than that percentile of recent latencies.
+HEDGE: Optional[Hedger] = None
+_UNHOOK_HEDGE: Optional[Callable[[], None]] = None
+
+
+def enable_hedging(percentile: float = 95.0, **kwargs: Any) -> Hedger:
+    """Hedge GETs slower than ``percentile``; kwargs go to Hedger."""
+    global HEDGE, _UNHOOK_HEDGE
+    disable_hedging()
+    HEDGE = Hedger(percentile, **kwargs)
+    _UNHOOK_HEDGE = METRICS.add_hook(end=HEDGE.observe)
+    return HEDGE
+
+
+def disable_hedging() -> None:
+    global HEDGE, _UNHOOK_HEDGE
+    if _UNHOOK_HEDGE is not None:
+        _UNHOOK_HEDGE()
+    if HEDGE is not None:
+        HEDGE.close()
+    HEDGE = _UNHOOK_HEDGE = None
+
+
+if os.getenv("OPALSTACK_HEDGE_PERCENTILE"):
+    enable_hedging(float(os.environ["OPALSTACK_HEDGE_PERCENTILE"]))
+
+
+# Opt-in traffic recording (OPALSTACK_RECORD=<path>, .gz to compress) of every
+# Transport call, for oc_skill.replay.
+RECORDER: Optional[Recorder] = None
+
+
+def enable_recording(path: str) -> Recorder:
+    global RECORDER
+    disable_recording()
+    RECORDER = Recorder(path, BASE_URL)
+    return RECORDER
+
+
+def disable_recording() -> None:
+    global RECORDER
+    if RECORDER is not None:
+        RECORDER.close()
+    RECORDER = None
+
+
+if os.getenv("OPALSTACK_RECORD"):
+    enable_recording(os.environ["OPALSTACK_RECORD"])
+
+
+def stats() -> dict:
+    """Snapshot of endpoint metrics, cache, coalescing, breaker and hedge counters."""
+    return {
+        "endpoints": METRICS.stats(),
+        "cache":     CACHE.stats() if CACHE is not None else None,
+        "flights":   FLIGHTS.stats(),
+        "breakers":  BREAKERS.stats() if BREAKERS is not None else None,
+        "hedge":     HEDGE.stats() if HEDGE is not None else None,
+        "since":     METRICS.since,
+    }
+
+
+def _timeouts(timeout: Tuple[float, float]) -> Tuple[float, float, bool]:
+    """(connect, read, clipped): the transport timeouts cut to the caller's deadline."""
+    left = remaining()
+    if left is None:
+        return timeout[0], timeout[1], False
+    if left <= 0:
+        raise DeadlineExceeded({"detail": "deadline exceeded"})
+    return min(timeout[0], left), min(timeout[1], left), left < timeout[1]
+
+
+def _budget(wait: float) -> None:
+    """Refuse a backoff sleep that would outlast the caller's deadline."""
+    left = remaining()
+    if left is not None and wait >= left:
+        raise DeadlineExceeded({"detail": "deadline exceeded before retry"})
+
+
+def _verdict(breaker: Optional[CircuitBreaker], status: Optional[int],
+             deadline_timeout: bool = False) -> None:
+    """Tell the breaker how an attempt went; timeouts caused by the caller's
+    own deadline say nothing about the API's health."""
+    if breaker is None:
+        return
+    if deadline_timeout:
+        breaker.release()
+    else:
+        breaker.record(status is not None and status < 500)
+
+
+def _split_timeout(timeout: Union[float, Tuple[float, float], None]) -> Tuple[float, float]:
+    if timeout is None:
+        return CONNECT_TIMEOUT, READ_TIMEOUT
+    if isinstance(timeout, tuple):
+        return float(timeout[0]), float(timeout[1])
+    return float(timeout), float(timeout)
+
+
+def _bytes_in(r: Any, stream: bool) -> int:
+    """Response body size; streamed bodies are not read, so use Content-Length."""
+    if stream:
+        return int(r.headers.get("Content-Length") or 0)
+    return len(r.content)
+
+
+def _retryable(status: int, retry: bool) -> bool:
+    return status == 429 or (retry and status in RETRY.statuses)
+
+
+# Optional on-disk mirror of the list endpoints (OPALSTACK_SNAPSHOT=<path>).
+SNAPSHOT: Optional[SnapshotStore] = SnapshotStore.from_env()
+
+
+def enable_snapshot(path: str, max_age: float = 300.0) -> SnapshotStore:
+    """Serve fresh list reads from a SQLite snapshot at ``path``."""
+    global SNAPSHOT
+    SNAPSHOT = SnapshotStore(path, max_age)
+    return SNAPSHOT
+
+
+def _snapshot_slot(path: str, params: Optional[dict]
+                   ) -> tuple[Optional[SnapshotStore], Optional[str]]:
+    store = SNAPSHOT
+    resource = list_resource(path, params) if store is not None else None
+    return (store, resource) if resource else (None, None)
+
+
+def _after_write(http: Any, path: str) -> None:
+    """Drop cached reads of the resource a POST just mutated."""
+    resource = resource_of(path)
+    _WRITES[(http.key, resource)] = next(_WRITE_SEQ)
+    if CACHE is not None:
+        CACHE.invalidate(http.key, resource)
+    store, resource = _snapshot_slot(f"/{resource}/list/", None)
+    if store is not None:
+        store.mark_stale(http.account, http.base_url, resource)
+
+
+def _request_key(owner: tuple, path: str, params: Optional[dict]) -> tuple:
+    return (owner, path, tuple(sorted((params or {}).items())))
+
+
+def _flight_key(key: tuple) -> tuple:
+    """``key`` plus its resource's write stamp; read it after the cache
+    generation and the snapshot ``since`` so both predate the stamp."""
+    return key + (_WRITES.get((key[0], resource_of(key[1])), 0),)
+
+
+def _cache_slot(key: tuple) -> Optional[ResponseCache]:
+    cache = CACHE
+    return cache if cache is not None and cacheable(key[1]) else None
+
+
+def _headers(token: str) -> dict[str, str]:
+    return {
+        "Authorization": f"Token {token}",
+        "Content-Type":  "application/json",
+        "Accept":        "application/json",
+        "User-Agent":    "oc-skill/0.1",
+    }
+
+
+class APIError(RuntimeError):
+    """Non-2xx response. ``args[0]`` is the decoded error payload."""
+
+    def __init__(self, payload: Any, status: Optional[int] = None) -> None:
+        super().__init__(payload)
+        self.status = status
+
 
 class Transport:
-    """Connection-reusing JSON client. Non-2xx raises RuntimeError."""
-
-    def __init__(self, token: str, timeout: float = 10.0) -> None:
-        self.session: Session = requests.Session()
-        self.session.headers.update({
-            "Authorization": f"Token {token}",
-            "Content-Type":  "application/json",
-            "Accept":        "application/json",
-            "User-Agent":    "oc-skill/0.1",
-        })
-        self.timeout = timeout
-
-    def _handle(self, resp: Response) -> Any:
+    """Connection-reusing JSON client. Non-2xx raises RuntimeError (APIError).
+
+    GETs retry 429/502/503/504 and connection failures with jittered
+    backoff; POSTs retry only 429 unless the caller passes ``retry=True``.
+    """
+
+    def __init__(self, token: str,
+                 timeout: Union[float, Tuple[float, float], None] = None,
+                 base_url: Optional[str] = None,
+                 pool_size: int = POOL_SIZE) -> None:
+        self.base_url = base_url or BASE_URL
+        self.key = (token, self.base_url)
+        self.account = account_of(token)
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.session: "Session" = requests.Session()
+        self.pool_size = pool_size  # keep-alive connections; batch workers are capped to it
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(_headers(token))
+        self.timeout = _split_timeout(timeout)
+        self.last_used = time.monotonic()
+        self._net_errors = (requests.ConnectionError, requests.Timeout)
+        self._timeout_errors = (requests.Timeout,)
+        self._offline_errors = self._net_errors + (CircuitOpenError,)
+
+    def close(self) -> None:
+        self.session.close()
+
+    @staticmethod
+    def _handle(resp: "Response") -> Any:
         if not 200 <= resp.status_code < 300:
             try:
                 payload = resp.json()
             except ValueError:
                 payload = resp.text
             LOG.error("HTTP %s → %s", resp.status_code, payload)
-            raise RuntimeError(payload)
+            raise APIError(payload, status=resp.status_code)
         try:
             return resp.json()
         except ValueError as exc:
-            raise RuntimeError("non-JSON response") from exc
+            raise APIError("non-JSON response", status=resp.status_code) from exc
+
+    def _send(self, method: str, path: str, retry: bool, **kwargs: Any) -> "Response":
+        call = METRICS.begin(method, path, kwargs.get("data"))
+        try:
+            r = self._attempts(call, method, path, retry, **kwargs)
+        except BaseException as exc:
+            METRICS.end(call, error=exc)
+            if RECORDER is not None and isinstance(exc, self._net_errors):
+                RECORDER.record_error(call, method, path, kwargs, exc)
+            raise
+        METRICS.end(call, r.status_code, _bytes_in(r, kwargs.get("stream", False)))
+        if RECORDER is not None:
+            RECORDER.record(call, method, path, kwargs, r)
+        return r
+
+    def _attempts(self, call: Call, method: str, path: str, retry: bool,
+                  **kwargs: Any) -> "Response":
+        policy = RETRY
+        breaker = BREAKERS.get(self.base_url) if BREAKERS is not None else None
+        for attempt in range(policy.retries + 1):
+            call.retries = attempt
+            if LIMITER is not None:
+                LIMITER.acquire()
+            connect, read, clipped = _timeouts(self.timeout)
+            if breaker is not None:
+                breaker.allow()
+            try:
+                r = self.session.request(method, self.base_url + path,
+                                         timeout=(connect, read),
+                                         headers=call.headers or None, **kwargs)
+            except self._net_errors as exc:
+                ours = clipped and isinstance(exc, self._timeout_errors)
+                _verdict(breaker, None, ours)
+                if ours:
+                    raise DeadlineExceeded({"detail": "deadline exceeded"}) from exc
+                if not retry or attempt == policy.retries:
+                    raise
+                wait = policy.delay(attempt)
+                LOG.warning("%s %s failed (%s); retry in %.2fs", method, path, exc, wait)
+            except BaseException:
+                # ChunkedEncodingError, TooManyRedirects, InvalidURL, ...: not
+                # retried and no verdict, but a half-open probe slot is freed
+                _verdict(breaker, None, True)
+                raise
+            else:
+                _verdict(breaker, r.status_code)
+                if attempt == policy.retries or not _retryable(r.status_code, retry):
+                    return r
+                wait = policy.delay(attempt, parse_retry_after(r.headers.get("Retry-After")))
+                LOG.warning("%s %s → HTTP %s; retry in %.2fs", method, path, r.status_code, wait)
+                r.close()
+            _budget(wait)
+            time.sleep(wait)
+
+    def _read(self, path: str, params: Optional[dict]) -> "Response":
+        """One GET, hedged with a duplicate when HEDGE says it is running slow."""
+        hedge = HEDGE
+        delay = hedge.delay(template(path)) if hedge is not None else None
+        if delay is None:
+            return self._send("GET", path, retry=True, params=params)
+        return hedge.run(lambda: self._send("GET", path, retry=True, params=params),
+                         delay, lambda r: r.close())
+
+    def get(self, path: str, params: Optional[dict] = None,
+            fresh: bool = False) -> Any:
+        """GET ``path``; ``fresh`` skips the cache and snapshot (still coalesced)."""
+        self.last_used = time.monotonic()
+        key = _request_key(self.key, path, params)
+        cache = None if fresh else _cache_slot(key)
+        gen = None
+        if cache is not None:
+            raw = cache.get(key)
+            if raw is not None:
+                return json.loads(raw)
+            gen = cache.generation(self.key, resource_of(path))
+        store, resource = _snapshot_slot(path, params)
+        if store is not None and not fresh:
+            rows = store.read(self.account, self.base_url, resource)
+            if rows is not None:
+                return rows
+        stamps = (gen, time.time())  # a later mark_stale means this list may be outdated
+        try:
+            # Followers share the leader's Response but each parses its own
+            # copy, and store it under the leader's stamps (its request's age).
+            r, (lead_gen, since) = FLIGHTS.do(
+                _flight_key(key), lambda: (self._read(path, params), stamps))
+        except self._offline_errors:
+            rows = store.read(self.account, self.base_url, resource,
+                              max_age=float("inf")) if store is not None else None
+            if rows is None:
+                raise
+            LOG.warning("%s unreachable; serving %s from snapshot", self.base_url, path)
+            return rows
+        data = self._handle(r)
+        if cache is not None:
+            cache.put(key, resource_of(path), r.content,
+                      gen if lead_gen is None else lead_gen)
+        if store is not None:
+            store.sync(self.account, self.base_url, resource, data, since)
+        return data
+
+    def iter_list(self, path: str, params: Optional[dict] = None,
+                  fields: Optional[Sequence[str]] = None) -> Iterator[Any]:
+        """Yield a list endpoint's elements while the body is still arriving.
+
+        Bypasses the cache and coalescing. ``fields`` projects each object
+        down to those keys as soon as it is parsed.
+        """
+        self.last_used = time.monotonic()
+        r = self._send("GET", path, retry=True, params=params, stream=True)
+        with r:
+            if not 200 <= r.status_code < 300:
+                self._handle(r)
+            yield from iter_array(r.iter_content(CHUNK_SIZE), fields)
+
+    def post(self, path: str, body: Any = None, retry: bool = False) -> Any:
+        self.last_used = time.monotonic()
+        try:
+            r = self._send("POST", path, retry=retry, data=json.dumps(body or {}))
+            return self._handle(r)
+        finally:
+            _after_write(self, path)
+
+
+class TransportPool:
+    """Process-wide Transports keyed by (token, base URL).
+
+    Each Transport keeps up to ``pool_size`` keep-alive connections so worker
+    threads share TLS sessions instead of handshaking per tool call.
+    Transports unused for ``idle_timeout`` seconds are closed on the next get(),
+    and at most ``max_size`` are kept (least recently used closed first), so
+    fanning out over many account tokens cannot grow sockets without bound.
+    Closing only drops idle sockets; requests in flight finish normally.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE,
+                 idle_timeout: float = POOL_IDLE,
+                 max_size: int = POOL_MAX) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.max_size = max(1, max_size)
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[tuple[str, str], Transport]" = OrderedDict()
+
+    def get(self, token: str, base_url: Optional[str] = None) -> Transport:
+        key = (token, base_url or BASE_URL)
+        with self._lock:
+            self._evict_idle_locked()
+            http = self._items.get(key)
+            if http is None:
+                http = Transport(token=token, base_url=key[1],
+                                 pool_size=self.pool_size)
+                self._items[key] = http
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)[1].close()
+            self._items.move_to_end(key)
+            http.last_used = time.monotonic()
+            return http
+
+    def _evict_idle_locked(self) -> int:
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = [k for k, t in self._items.items() if t.last_used < cutoff]
+        for k in stale:
+            self._items.pop(k).close()
+        return len(stale)
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            items, self._items = list(self._items.values()), OrderedDict()
+        for http in items:
+            http.close()
+
+
+POOL = TransportPool()
+
+
+def get_transport(token: str, base_url: Optional[str] = None) -> Transport:
+    return POOL.get(token, base_url)
+
+
+def shutdown() -> None:
+    """Close every pooled connection. Safe to call more than once."""
+    POOL.close()
+
+
+atexit.register(shutdown)
+
+
+class AsyncTransport:
+    """asyncio counterpart of Transport backed by httpx.AsyncClient.
+
+    At most ``concurrency`` requests are in flight per transport; the rest
+    wait on a semaphore instead of opening more sockets. Responses go
+    through Transport._handle, so errors are identical to the sync client.
+    """
+
+    def __init__(self, token: str,
+                 timeout: Union[float, Tuple[float, float], None] = None,
+                 base_url: Optional[str] = None,
+                 concurrency: int = ASYNC_CONCURRENCY) -> None:
+        try:
+            import httpx
+        except ImportError as exc:
+            raise RuntimeError(
+                "AsyncTransport needs httpx: pip install 'oc-skill[async]'"
+            ) from exc
+        self.base_url = base_url or BASE_URL
+        self.key = (token, self.base_url)
+        self.account = account_of(token)
+        self.client = httpx.AsyncClient(
+            headers=_headers(token),
+            limits=httpx.Limits(max_connections=concurrency,
+                                max_keepalive_connections=concurrency,
+                                keepalive_expiry=POOL_IDLE),
+        )
+        self._sem = asyncio.Semaphore(concurrency)
+        self.timeout = _split_timeout(timeout)
+        self._httpx_timeout = httpx.Timeout
+        self._net_errors = (httpx.TransportError,)
+        self._timeout_errors = (httpx.TimeoutException,)
+        self._offline_errors = self._net_errors + (CircuitOpenError,)
+        self.flights = AsyncSingleFlight()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _send(self, method: str, path: str, retry: bool,
+                    stream: bool = False, **kwargs: Any) -> Any:
+        call = METRICS.begin(method, path, kwargs.get("content"))
+        try:
+            r = await self._attempts(call, method, path, retry, stream, **kwargs)
+        except BaseException as exc:
+            METRICS.end(call, error=exc)
+            raise
+        METRICS.end(call, r.status_code, _bytes_in(r, stream))
+        return r
+
+    async def _attempts(self, call: Call, method: str, path: str, retry: bool,
+                        stream: bool, **kwargs: Any) -> Any:
+        policy = RETRY
+        breaker = BREAKERS.get(self.base_url) if BREAKERS is not None else None
+        for attempt in range(policy.retries + 1):
+            call.retries = attempt
+            if LIMITER is not None:
+                wait = LIMITER.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            connect, read, clipped = _timeouts(self.timeout)
+            if breaker is not None:
+                breaker.allow()
+            try:
+                req = self.client.build_request(
+                    method, self.base_url + path, headers=call.headers or None,
+                    timeout=self._httpx_timeout(read, connect=connect), **kwargs)
+                async with self._sem:
+                    r = await self.client.send(req, stream=stream)
+            except self._net_errors as exc:
+                ours = clipped and isinstance(exc, self._timeout_errors)
+                _verdict(breaker, None, ours)
+                if ours:
+                    raise DeadlineExceeded({"detail": "deadline exceeded"}) from exc
+                if not retry or attempt == policy.retries:
+                    raise
+                wait = policy.delay(attempt)
+                LOG.warning("%s %s failed (%s); retry in %.2fs", method, path, exc, wait)
+            except BaseException:
+                # cancellation, DecodingError, TooManyRedirects, InvalidURL, ...
+                _verdict(breaker, None, True)
+                raise
+            else:
+                _verdict(breaker, r.status_code)
+                if attempt == policy.retries or not _retryable(r.status_code, retry):
+                    return r
+                wait = policy.delay(attempt, parse_retry_after(r.headers.get("Retry-After")))
+                LOG.warning("%s %s → HTTP %s; retry in %.2fs", method, path, r.status_code, wait)
+                await r.aclose()
+            _budget(wait)
+            await asyncio.sleep(wait)
+
+    async def _read(self, path: str, params: Optional[dict]) -> Any:
+        """Async form of Transport._read; the slower duplicate is cancelled."""
+        hedge = HEDGE
+        delay = hedge.delay(template(path)) if hedge is not None else None
+        if delay is None:
+            return await self._send("GET", path, retry=True, params=params)
+        return await hedge.arun(
+            lambda: self._send("GET", path, retry=True, params=params), delay)
+
+    async def get(self, path: str, params: Optional[dict] = None,
+                  fresh: bool = False) -> Any:
+        key = _request_key(self.key, path, params)
+        cache = None if fresh else _cache_slot(key)
+        gen = None
+        if cache is not None:
+            raw = cache.get(key)
+            if raw is not None:
+                return json.loads(raw)
+            gen = cache.generation(self.key, resource_of(path))
+        store, resource = _snapshot_slot(path, params)
+        if store is not None and not fresh:
+            rows = store.read(self.account, self.base_url, resource)
+            if rows is not None:
+                return rows
+        stamps = (gen, time.time())
+
+        async def lead() -> tuple:
+            return await self._read(path, params), stamps
+
+        try:
+            r, (lead_gen, since) = await self.flights.ado(_flight_key(key), lead)
+        except self._offline_errors:
+            rows = store.read(self.account, self.base_url, resource,
+                              max_age=float("inf")) if store is not None else None
+            if rows is None:
+                raise
+            LOG.warning("%s unreachable; serving %s from snapshot", self.base_url, path)
+            return rows
+        data = Transport._handle(r)
+        if cache is not None:
+            cache.put(key, resource_of(path), r.content,
+                      gen if lead_gen is None else lead_gen)
+        if store is not None:
+            store.sync(self.account, self.base_url, resource, data, since)
+        return data
+
+    async def iter_list(self, path: str, params: Optional[dict] = None,
+                        fields: Optional[Sequence[str]] = None) -> AsyncIterator[Any]:
+        """Async form of Transport.iter_list."""
+        r = await self._send("GET", path, retry=True, stream=True, params=params)
+        try:
+            if not 200 <= r.status_code < 300:
+                await r.aread()
+                Transport._handle(r)
+            parser = ArrayParser(fields)
+            async for chunk in r.aiter_bytes(CHUNK_SIZE):
+                for item in parser.feed(chunk):
+                    yield item
+            for item in parser.close():
+                yield item
+        finally:
+            await r.aclose()
+
+    async def post(self, path: str, body: Any = None, retry: bool = False) -> Any:
+        try:
+            r = await self._send("POST", path, retry=retry,
+                                 content=json.dumps(body or {}))
+            return Transport._handle(r)
+        finally:
+            _after_write(self, path)
+
+
+# httpx clients are bound to the loop that first used them, so async
+# transports are pooled per running event loop.
+_ASYNC_POOL: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_transport(token: str,
+                        base_url: Optional[str] = None) -> AsyncTransport:
+    """Return the AsyncTransport for this token on the running loop."""
+    items = _ASYNC_POOL.setdefault(asyncio.get_running_loop(), {})
+    key = (token, base_url or BASE_URL)
+    http = items.get(key)
+    if http is None:
+        http = items[key] = AsyncTransport(token=token, base_url=key[1])
+    return http
 
-    def get(self, path: str, params: Optional[dict] = None) -> Any:
-        r = self.session.get(BASE_URL + path, params=params, timeout=self.timeout)
-        return self._handle(r)
 
-    def post(self, path: str, body: Any = None) -> Any:
-        r = self.session.post(BASE_URL + path,
-                              data=json.dumps(body or {}),
-                              timeout=self.timeout)
-        return self._handle(r)
+async def ashutdown() -> None:
+    """Close every async transport owned by the running loop."""
+    items = _ASYNC_POOL.pop(asyncio.get_running_loop(), {})
+    for http in items.values():
+        await http.aclose()
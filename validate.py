@@ -0,0 +1,195 @@
+"""Local payload validation compiled from the tool docstring schemas.
+
+Each action's ``payload`` schema is compiled once into nested closures that
+check required keys, types, enums and the ``uuid``/``uri`` formats. Batch
+actions (``create_many`` ...) check every item against the matching
+single-object action, so a bad item is reported as ``items[3].name`` before
+anything is sent.
+"""
+
+import functools
+import re
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .schema import parse
+
+MAX_ERRORS = 50
+
+_UUID = re.compile(r"^[0-9a-fA-F]{8}-?([0-9a-fA-F]{4}-?){3}[0-9a-fA-F]{12}$")
+_TYPES = {
+    "string":  str,
+    "integer": int,
+    "number":  (int, float),
+    "boolean": bool,
+    "array":   list,
+    "object":  dict,
+    "null":    type(None),
+}
+_BATCH = {"create_many": "create", "update_many": "update", "delete_many": "delete"}
+
+Errors = List[Dict[str, str]]
+Check = Callable[[Any, str, Errors], None]
+
+
+class ValidationError(ValueError):
+    """Payload rejected locally. ``args[0]`` is {action, errors}; ``errors``
+    lists {path, message} for each problem found (up to MAX_ERRORS)."""
+
+    def __init__(self, action: str, errors: Errors) -> None:
+        super().__init__({"action": action, "errors": errors})
+        self.action = action
+        self.errors = errors
+
+
+def _add(errors: Errors, path: str, message: str) -> None:
+    if len(errors) < MAX_ERRORS:
+        errors.append({"path": path or "payload", "message": message})
+
+
+def _join(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
+
+
+def _type_name(value: Any) -> str:
+    for name, cls in _TYPES.items():
+        if isinstance(value, cls) and not (name in ("integer", "number") and isinstance(value, bool)):
+            return name
+    return type(value).__name__
+
+
+def compile_node(node: Optional[Dict[str, Any]]) -> Check:
+    """Schema node -> check(value, path, errors)."""
+    node = node or {}
+    checks: List[Check] = []
+
+    names = node.get("type")
+    if not names and (node.get("required") or node.get("properties")):
+        names = "object"
+    if names:
+        names = names if isinstance(names, list) else [names]
+        types = tuple(_TYPES[n] for n in names if n in _TYPES)
+        no_bool = "boolean" not in names
+
+        def check_type(value: Any, path: str, errors: Errors) -> bool:
+            if isinstance(value, types) and not (no_bool and isinstance(value, bool)):
+                return True
+            _add(errors, path, f"expected {' or '.join(names)}, got {_type_name(value)}")
+            return False
+    else:
+        def check_type(value: Any, path: str, errors: Errors) -> bool:
+            return True
+
+    if "enum" in node:
+        allowed = node["enum"]
+
+        def check_enum(value: Any, path: str, errors: Errors) -> None:
+            if value not in allowed:
+                _add(errors, path, f"must be one of {allowed}")
+        checks.append(check_enum)
+
+    fmt = node.get("format")
+    if fmt == "uuid":
+        def check_uuid(value: Any, path: str, errors: Errors) -> None:
+            if isinstance(value, str) and not _UUID.match(value):
+                _add(errors, path, "not a valid uuid")
+        checks.append(check_uuid)
+    elif fmt == "uri":
+        def check_uri(value: Any, path: str, errors: Errors) -> None:
+            if isinstance(value, str):
+                parts = urlsplit(value)
+                if not (parts.scheme and parts.netloc):
+                    _add(errors, path, "not a valid uri")
+        checks.append(check_uri)
+
+    required = tuple(node.get("required") or ())
+    props = {k: compile_node(v) for k, v in (node.get("properties") or {}).items()}
+    if required or props:
+        def check_object(value: Any, path: str, errors: Errors) -> None:
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if value.get(key) is None:
+                    _add(errors, _join(path, key), "is required")
+            for key, check in props.items():
+                if key in value and value[key] is not None:
+                    check(value[key], _join(path, key), errors)
+        checks.append(check_object)
+
+    if "items" in node:
+        item = compile_node(node["items"])
+
+        def check_items(value: Any, path: str, errors: Errors) -> None:
+            if not isinstance(value, list):
+                return
+            for i, v in enumerate(value):
+                if len(errors) >= MAX_ERRORS:
+                    return
+                item(v, f"{path}[{i}]", errors)
+        checks.append(check_items)
+
+    def check(value: Any, path: str, errors: Errors) -> None:
+        if check_type(value, path, errors):
+            for c in checks:
+                c(value, path, errors)
+    return check
+
+
+def _batch_payload(payload: Dict[str, Any], single: Dict[str, Any]) -> Dict[str, Any]:
+    """Narrow a batch action's ``items: {type: object}`` to the single action's payload."""
+    props = dict(payload.get("properties") or {})
+    items = dict(props.get("items") or {})
+    items["items"] = {"type": "object", **(single or {})}
+    props["items"] = items
+    return {**payload, "properties": props}
+
+
+def compile_actions(schema: Dict[str, Any]) -> Dict[str, Optional[Callable[[Any], Errors]]]:
+    """action -> validate(payload) returning the list of errors (None: no payload)."""
+    actions = schema.get("actions") or {}
+    out: Dict[str, Optional[Callable[[Any], Errors]]] = {}
+    for name, spec in actions.items():
+        payload = (spec or {}).get("payload")
+        if not payload:
+            out[name] = None
+            continue
+        single = _BATCH.get(name)
+        if single and single in actions and "items" in (payload.get("properties") or {}):
+            payload = _batch_payload(payload, actions[single].get("payload"))
+        check = compile_node(payload)
+        required = payload.get("required") or []
+        # Batch shorthand: a bare list stands for the one required array key.
+        shorthand = (required[0] if len(required) == 1 and
+                     (payload.get("properties") or {}).get(required[0], {}).get("type") == "array"
+                     else None)
+
+        def validate(data: Any, check=check, shorthand=shorthand) -> Errors:
+            errors: Errors = []
+            if isinstance(data, list) and shorthand:
+                check({shorthand: data}, "", errors)
+                for e in errors:
+                    e["path"] = e["path"].replace(shorthand, "payload", 1)
+            else:
+                check({} if data is None else data, "", errors)
+            return errors
+        out[name] = validate
+    return out
+
+
+@functools.lru_cache(maxsize=None)
+def compile_doc(doc: str) -> Dict[str, Optional[Callable[[Any], Errors]]]:
+    """Parse and compile a tool docstring once per distinct text."""
+    return compile_actions(parse(doc))
+
+
+def check(doc: str, action: str, payload: Any) -> None:
+    """Raise ValidationError if ``payload`` does not fit ``action`` in ``doc``."""
+    validators = compile_doc(doc)
+    if action not in validators:
+        raise ValidationError(action, [{"path": "action",
+                                        "message": f"must be one of {list(validators)}"}])
+    validate = validators[action]
+    if validate is not None:
+        errors = validate(payload)
+        if errors:
+            raise ValidationError(action, errors)
@@ -0,0 +1,374 @@
+"""Change feed for account resources.
+
+One background poller per (account, base URL, resource kind) lists the
+resource, hashes every object with ``snapshot.digest`` and diffs the hashes
+against the previous round. Every subscriber of that kind gets the same
+``created`` / ``updated`` / ``deleted`` events, so ten watchers of "app"
+cost one list call per round, not ten. The interval backs off by 1.5x while
+nothing changes and drops back to the base interval on any change. After
+the last subscriber leaves, the poller stops but keeps its baseline for
+GRACE seconds, so the next subscriber still sees what changed in between.
+
+    for event in watch(token, ["app", "domain"]):
+        ...
+
+    async for event in awatch(token, ["mariadb"]):
+        ...
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Literal, Optional, Sequence
+
+from . import transport
+from .app import ApplicationAPI
+from .domain import DomainAPI
+from .mariadb import MariaDBAPI
+from .osuser import OSUserAPI
+from .psqldb import PSQLDBAPI
+from .skill import SkillBase, validated
+from .snapshot import account_of, digest
+
+logger = logging.getLogger("oc_skill.watch")
+
+INTERVAL = 5.0
+MAX_INTERVAL = 60.0
+GRACE = 300.0
+
+# resource kind -> API class whose iter_list the poller uses
+APIS = {
+    "app":     ApplicationAPI,
+    "osuser":  OSUserAPI,
+    "domain":  DomainAPI,
+    "mariadb": MariaDBAPI,
+    "psqldb":  PSQLDBAPI,
+}
+
+
+def _changed(old: dict, new: dict) -> List[str]:
+    return sorted(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+
+
+def diff(kind: str, before: Dict[str, tuple], objects: list
+         ) -> tuple[Dict[str, tuple], List[dict]]:
+    """New {id: (hash, obj)} state and the events that lead to it from ``before``."""
+    now = time.time()
+    after: Dict[str, tuple] = {}
+    events: List[dict] = []
+    for obj in objects:
+        if not isinstance(obj, dict) or obj.get("id") is None:
+            continue
+        oid = str(obj["id"])
+        h = digest(obj)
+        after[oid] = (h, obj)
+        old = before.get(oid)
+        if old is None:
+            events.append({"type": "created", "kind": kind, "id": oid, "object": obj, "at": now})
+        elif old[0] != h:
+            events.append({"type": "updated", "kind": kind, "id": oid, "object": obj,
+                           "changed": _changed(old[1], obj), "at": now})
+    for oid, (_, obj) in before.items():
+        if oid not in after:
+            events.append({"type": "deleted", "kind": kind, "id": oid, "object": obj, "at": now})
+    return after, events
+
+
+class Feed:
+    """The shared poller for one resource kind of one account.
+
+    Runs on a daemon thread while it has subscribers. The first round only
+    records the baseline. A failed round is logged, leaves the state as it
+    was and backs off like an idle one.
+    """
+
+    def __init__(self, token: str, base_url: Optional[str], kind: str) -> None:
+        self.token = token
+        self.base_url = base_url
+        self.kind = kind
+        self.polls = 0
+        self.errors = 0
+        self.events = 0
+        self.interval = INTERVAL
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._subs: Dict[int, tuple] = {}
+        self._state: Optional[Dict[str, tuple]] = None
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._idle_since: Optional[float] = None
+
+    def subscribe(self, sink: Callable[[dict], None], interval: float,
+                  max_interval: float, initial: bool = False) -> int:
+        """Send every later event to ``sink``; returns the subscription id.
+
+        With ``initial``, objects that already exist are sent first as
+        ``created`` events marked ``"initial": true``.
+        """
+        with self._lock:
+            sid = id(sink)
+            self._subs[sid] = (sink, interval, max_interval)
+            if self._thread is None:
+                if self._idle_since is not None and time.monotonic() - self._idle_since > GRACE:
+                    self._state = None
+                    self._ready.clear()
+                self._idle_since = None
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name=f"oc-watch-{self.kind}")
+                self._thread.start()
+            elif interval < self.interval:
+                self._wake.set()
+        if initial:
+            self._ready.wait()
+            with self._lock:
+                objs = [obj for _, obj in (self._state or {}).values()]
+            now = time.time()
+            for obj in objs:
+                sink({"type": "created", "kind": self.kind, "id": str(obj["id"]),
+                      "object": obj, "at": now, "initial": True})
+        return sid
+
+    def unsubscribe(self, sid: int) -> bool:
+        """Drop a subscriber; True when it was the last one.
+
+        The poller then stops. Its baseline is kept for GRACE seconds: a
+        subscriber within that time gets the changes made while nobody was
+        watching (e.g. between two ``changes`` calls); a later one starts
+        from a fresh baseline instead of a burst for the whole idle gap.
+        """
+        with self._lock:
+            self._subs.pop(sid, None)
+            if self._subs:
+                return False
+            self._thread = None
+            self._idle_since = time.monotonic()
+        self._wake.set()
+        return True
+
+    def _bounds(self) -> tuple[float, float]:
+        with self._lock:
+            subs = list(self._subs.values())
+        if not subs:
+            return INTERVAL, MAX_INTERVAL
+        return min(s[1] for s in subs), min(s[2] for s in subs)
+
+    def poll(self) -> List[dict]:
+        """One round: list, diff, fan the events out to every subscriber."""
+        api = APIS[self.kind](self.token)
+        if self.base_url:
+            api.http = transport.get_transport(self.token, self.base_url)
+        objects = list(api.iter_list())
+        with self._lock:
+            if not self._subs:
+                return []  # unsubscribed mid-round; keep the baseline as it was
+            before = self._state
+            self._state, events = diff(self.kind, before or {}, objects)
+            self.polls += 1
+            if before is None:
+                events = []
+            self.events += len(events)
+            sinks = [s[0] for s in self._subs.values()]
+        self._ready.set()
+        for event in events:
+            for sink in sinks:
+                sink(event)
+        return events
+
+    def _run(self) -> None:
+        me = threading.current_thread()
+        self.interval = self._bounds()[0]
+        while self._thread is me:
+            base, cap = self._bounds()
+            try:
+                events = self.poll()
+            except Exception as exc:
+                self.errors += 1
+                events = []
+                logger.warning("watch %s: poll failed: %s", self.kind, exc)
+                self._ready.set()
+            self.interval = base if events else min(cap, max(base, self.interval * 1.5))
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"subscribers": len(self._subs), "polls": self.polls,
+                    "errors": self.errors, "events": self.events,
+                    "objects": len(self._state or {}),
+                    "interval": round(self.interval, 2)}
+
+
+# Feeds stay registered (at most five per account and base URL) and are
+# restarted by the next subscriber after their last one leaves.
+_LOCK = threading.Lock()
+_FEEDS: Dict[tuple, Feed] = {}
+
+
+def _feeds(token: str, base_url: Optional[str], kinds: Optional[Sequence[str]]) -> List[Feed]:
+    kinds = list(kinds or APIS)
+    unknown = [k for k in kinds if k not in APIS]
+    if unknown:
+        raise ValueError(f"unknown resource kinds: {unknown}")
+    url = base_url or transport.BASE_URL
+    out = []
+    with _LOCK:
+        for kind in kinds:
+            key = (account_of(token), url, kind)
+            feed = _FEEDS.get(key)
+            if feed is None:
+                feed = _FEEDS[key] = Feed(token, base_url, kind)
+            out.append(feed)
+    return out
+
+
+class Subscription:
+    """Events from one or more feeds, delivered through a thread-safe sink."""
+
+    def __init__(self, feeds: List[Feed], sink: Callable[[dict], None]) -> None:
+        self.feeds = feeds
+        self.sink = sink
+        self.sids: List[int] = []
+
+    def start(self, interval: float, max_interval: float, initial: bool) -> None:
+        for feed in self.feeds:
+            self.sids.append(feed.subscribe(self.sink, interval, max_interval, initial))
+
+    def close(self) -> None:
+        for feed, sid in zip(self.feeds, self.sids):
+            feed.unsubscribe(sid)
+        self.sids = []
+
+
+def watch(token: str, kinds: Optional[Sequence[str]] = None, *,
+          base_url: Optional[str] = None, interval: float = INTERVAL,
+          max_interval: float = MAX_INTERVAL, initial: bool = False,
+          timeout: Optional[float] = None) -> Iterator[dict]:
+    """Yield change events for ``kinds`` (default: all five) as they are seen.
+
+    Runs until the caller stops iterating, or for ``timeout`` seconds.
+    Closing the generator unsubscribes; the last subscriber stops the poller.
+    """
+    events: "queue.Queue[dict]" = queue.Queue()
+    sub = Subscription(_feeds(token, base_url, kinds), events.put)
+    sub.start(interval, max_interval, initial)
+    end = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            left = None if end is None else end - time.monotonic()
+            if left is not None and left <= 0:
+                return
+            try:
+                yield events.get(timeout=left)
+            except queue.Empty:
+                return
+    finally:
+        sub.close()
+
+
+async def awatch(token: str, kinds: Optional[Sequence[str]] = None, *,
+                 base_url: Optional[str] = None, interval: float = INTERVAL,
+                 max_interval: float = MAX_INTERVAL, initial: bool = False,
+                 timeout: Optional[float] = None) -> AsyncIterator[dict]:
+    """asyncio form of watch; shares the same pollers as sync subscribers."""
+    loop = asyncio.get_running_loop()
+    events: "asyncio.Queue[dict]" = asyncio.Queue()
+    sub = Subscription(_feeds(token, base_url, kinds),
+                       lambda e: loop.call_soon_threadsafe(events.put_nowait, e))
+    # subscribe() waits for the baseline when initial=True; keep it off the loop.
+    await loop.run_in_executor(None, sub.start, interval, max_interval, initial)
+    end = None if timeout is None else loop.time() + timeout
+    try:
+        while True:
+            left = None if end is None else end - loop.time()
+            if left is not None and left <= 0:
+                return
+            try:
+                yield await asyncio.wait_for(events.get(), left)
+            except asyncio.TimeoutError:
+                return
+    finally:
+        sub.close()
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Per-feed counters keyed "kind@base_url"."""
+    with _LOCK:
+        feeds = list(_FEEDS.items())
+    return {f"{kind}@{url}": feed.stats() for (_, url, kind), feed in feeds}
+
+
+class WatchAPI:
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def changes(self, data: Dict[str, Any]) -> dict:
+        """Collect events for up to ``timeout`` seconds or ``max_events`` events."""
+        limit = int(data.get("max_events") or 100)
+        wait = float(data.get("timeout") or 30)
+        out: List[dict] = []
+        stream = watch(self.token, data.get("resources"),
+                       interval=float(data.get("interval") or INTERVAL),
+                       initial=bool(data.get("initial")), timeout=wait)
+        try:
+            for event in stream:
+                out.append(event)
+                if len(out) >= limit:
+                    break
+        finally:
+            stream.close()
+        return {"events": out, "count": len(out)}
+
+    def status(self, data: Dict[str, Any]) -> dict:
+        return stats()
+
+
+class WatchTools(SkillBase):
+    @validated
+    def watch(
+        self,
+        action: Literal["changes", "status"],
+        payload: Any | None = None,
+    ):
+        """---
+        name: watch
+        description: |
+            Change feed for apps, OS users, domains, MariaDB and PostgreSQL
+            databases. Waits for created, updated or deleted objects instead
+            of re-listing and diffing by hand. Watchers of the same account
+            and resource share one background poll whose interval backs off
+            while nothing changes. Updated events list the changed keys.
+            Changes made between two changes calls up to 5 minutes apart
+            are reported by the second call.
+
+        parameters:
+            type: object
+            properties:
+                action:
+                    type: string
+                    enum: [changes, status]
+                payload:
+                    type: [object, "null"]
+            required: [action]
+
+        actions:
+            changes:
+                summary: Wait up to timeout seconds and return the change events seen since the previous changes call (or from now on, if none in the last 5 minutes).
+                payload:
+                    properties:
+                        resources:  { type: array, items: { type: string, enum: [app, osuser, domain, mariadb, psqldb] }, description: "Default: all." }
+                        timeout:    { type: number, default: 30 }
+                        max_events: { type: integer, default: 100, description: "Return as soon as this many arrive." }
+                        interval:   { type: number, default: 5, description: "Base poll interval, seconds." }
+                        initial:    { type: boolean, default: false, description: "Also report existing objects as created." }
+            status:
+                summary: Active shared pollers with subscriber, poll and event counts.
+                payload: null
+        ...
+        """
+        api = WatchAPI(token=self._token())
+        return {
+            "changes": api.changes,
+            "status":  api.status,
+        }[action](payload or {})